@@ -0,0 +1,298 @@
+"""baseline schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+Existing databases were created from the models directly, so every table
+and column is created only when it is missing. Run `alembic upgrade head`
+on such a database without stamping it first.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def create_table(name, *columns, **kwargs):
+    if not sa.inspect(op.get_bind()).has_table(name):
+        op.create_table(name, *columns, **kwargs)
+
+
+def add_column(table, column):
+    columns = sa.inspect(op.get_bind()).get_columns(table)
+    if column.name not in {c["name"] for c in columns}:
+        op.add_column(table, column)
+
+
+def upgrade():
+    create_table(
+        "organization",
+        sa.Column("organization_id", sa.Integer, primary_key=True),
+        sa.Column("name", sa.String(150), nullable=False),
+        sa.Column("type", sa.String(50)),
+        sa.Column("city", sa.String(100)),
+        sa.Column("street", sa.String(100)),
+        sa.Column("building", sa.String(20)),
+        sa.Column("phone_number", sa.String(20)),
+        sa.Column("email", sa.String(150), nullable=False),
+        sa.Column("password_hash", sa.String(255), nullable=False),
+        sa.Column("edrpou", sa.String(20)),
+        sa.Column("status", sa.Boolean),
+    )
+
+    create_table(
+        "users",
+        sa.Column("user_id", sa.Integer, primary_key=True),
+        sa.Column("last_name", sa.String(100), nullable=False),
+        sa.Column("first_name", sa.String(100), nullable=False),
+        sa.Column("patronymic", sa.String(100)),
+        sa.Column("password_hash", sa.String(255), nullable=False),
+        sa.Column("phone_number", sa.String(20)),
+        sa.Column("email", sa.String(150), nullable=False),
+        sa.Column("city", sa.String(100)),
+        sa.Column("status", sa.Boolean),
+    )
+
+    create_table(
+        "clientcompanies",
+        sa.Column("client_id", sa.Integer, primary_key=True),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("type", sa.String(100)),
+        sa.Column("city", sa.String(100)),
+        sa.Column("street", sa.String(100)),
+        sa.Column("building", sa.String(20)),
+        sa.Column("phone_number", sa.String(20)),
+        sa.Column("email", sa.String(150), nullable=False),
+        sa.Column("password_hash", sa.String(255), nullable=False),
+        sa.Column("edrpou", sa.String(20)),
+        sa.Column("status", sa.Boolean),
+    )
+
+    create_table(
+        "admins",
+        sa.Column("admin_id", sa.Integer, primary_key=True),
+        sa.Column("last_name", sa.String(100), nullable=False),
+        sa.Column("first_name", sa.String(100), nullable=False),
+        sa.Column("patronymic", sa.String(100)),
+        sa.Column("password_hash", sa.String(255), nullable=False),
+        sa.Column("email", sa.String(150), nullable=False),
+    )
+
+    create_table(
+        "containersite",
+        sa.Column("container_site_id", sa.Integer, primary_key=True),
+        sa.Column("location_lat", sa.String(100), nullable=False),
+        sa.Column("location_lng", sa.String(100), nullable=False),
+        sa.Column("city", sa.String(100)),
+        sa.Column("street", sa.String(100)),
+        sa.Column("building", sa.String(20)),
+        sa.Column("entrance", sa.String(10)),
+        sa.Column("description", sa.Text),
+        sa.Column("organization_id", sa.Integer, sa.ForeignKey(
+            "organization.organization_id", ondelete="CASCADE")),
+    )
+
+    create_table(
+        "vehicles",
+        sa.Column("vehicle_id", sa.Integer, primary_key=True),
+        sa.Column("vehicle_name", sa.String(100)),
+        sa.Column("number_plate", sa.String(20), nullable=False, unique=True),
+        sa.Column("daily_capacity", sa.Integer),
+        sa.Column("organization_id", sa.Integer, sa.ForeignKey(
+            "containersite.container_site_id", ondelete="CASCADE")),
+    )
+    add_column("vehicles", sa.Column("daily_capacity", sa.Integer))
+
+    create_table(
+        "containers",
+        sa.Column("container_id", sa.Integer, primary_key=True),
+        sa.Column("type", sa.String(50), nullable=False),
+        sa.Column("capacity", sa.Integer),
+        sa.Column("fill_level", sa.Integer),
+        sa.Column("temperature", sa.Float),
+        sa.Column("tilted", sa.Boolean),
+        sa.Column("status", sa.String(50), nullable=False),
+        sa.Column("last_update", sa.DateTime),
+        sa.Column("container_site_id", sa.Integer, sa.ForeignKey(
+            "containersite.container_site_id", ondelete="CASCADE")),
+    )
+
+    create_table(
+        "devices",
+        sa.Column("device_id", sa.Integer, primary_key=True),
+        sa.Column("device_name", sa.String(100), nullable=False),
+        sa.Column("serial_number", sa.String(100), nullable=False),
+        sa.Column("device_type", sa.String(50)),
+        sa.Column("last_signal", sa.TIMESTAMP, server_default=sa.func.now()),
+        sa.Column("battery_level", sa.Integer),
+        sa.Column("status", sa.String(50)),
+        sa.Column("container_id", sa.Integer, sa.ForeignKey(
+            "containers.container_id", ondelete="SET NULL")),
+    )
+
+    create_table(
+        "pickups",
+        sa.Column("pickup_id", sa.Integer, primary_key=True),
+        sa.Column("scheduled_time", sa.DateTime),
+        sa.Column("completed_time", sa.DateTime),
+        sa.Column("container_site_id", sa.Integer, sa.ForeignKey(
+            "containersite.container_site_id", ondelete="CASCADE")),
+        sa.Column("vehicle_id", sa.Integer, sa.ForeignKey(
+            "vehicles.vehicle_id", ondelete="SET NULL")),
+    )
+
+    create_table(
+        "disposal_requests",
+        sa.Column("request_id", sa.Integer, primary_key=True),
+        sa.Column("waste_type", sa.String(100), nullable=False),
+        sa.Column("waste_description", sa.Text),
+        sa.Column("amount_kg", sa.Float),
+        sa.Column("created_at", sa.DateTime),
+        sa.Column("updated_at", sa.DateTime),
+        sa.Column("status", sa.String(50)),
+        sa.Column("organization_id", sa.Integer, sa.ForeignKey(
+            "organization.organization_id", ondelete="CASCADE")),
+        sa.Column("client_id", sa.Integer, sa.ForeignKey(
+            "clientcompanies.client_id", ondelete="CASCADE")),
+    )
+
+    create_table(
+        "notifications",
+        sa.Column("notification_id", sa.Integer, primary_key=True),
+        sa.Column("message", sa.Text, nullable=False),
+        sa.Column("message_type", sa.String(50), nullable=False),
+        sa.Column("created_at", sa.DateTime),
+        sa.Column("user_id", sa.Integer, sa.ForeignKey(
+            "users.user_id", ondelete="CASCADE")),
+        sa.Column("city", sa.String(100)),
+        sa.Column("container_id", sa.Integer, sa.ForeignKey(
+            "containers.container_id")),
+        sa.Column("container_site_id", sa.Integer, sa.ForeignKey(
+            "containersite.container_site_id", ondelete="SET NULL")),
+    )
+    add_column("notifications", sa.Column("city", sa.String(100)))
+
+    create_table(
+        "notification_cursors",
+        sa.Column("user_id", sa.Integer, sa.ForeignKey(
+            "users.user_id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("last_read_at", sa.DateTime, nullable=False),
+    )
+
+    create_table(
+        "telemetry_history",
+        sa.Column("container_id", sa.Integer, primary_key=True),
+        sa.Column("recorded_at", sa.DateTime, primary_key=True),
+        sa.Column("fill_level", sa.SmallInteger),
+        sa.Column("temperature", sa.REAL),
+        sa.Column("tilted", sa.Boolean),
+        sa.Column("battery_level", sa.SmallInteger),
+        postgresql_partition_by="RANGE (recorded_at)",
+    )
+    if op.get_bind().dialect.name == "postgresql":
+        # показання без денної секції потрапляють сюди, а не падають з помилкою
+        op.execute(
+            "CREATE TABLE IF NOT EXISTS telemetry_history_default "
+            "PARTITION OF telemetry_history DEFAULT"
+        )
+
+    create_table(
+        "telemetry_rollups",
+        sa.Column("container_id", sa.Integer, primary_key=True),
+        sa.Column("bucket_seconds", sa.Integer, primary_key=True),
+        sa.Column("bucket_start", sa.DateTime, primary_key=True),
+        sa.Column("samples", sa.Integer, nullable=False),
+        sa.Column("min_fill", sa.SmallInteger),
+        sa.Column("max_fill", sa.SmallInteger),
+        sa.Column("avg_fill", sa.REAL),
+        sa.Column("max_temperature", sa.REAL),
+        sa.Column("tilt_count", sa.Integer, nullable=False),
+    )
+
+    create_table(
+        "alert_states",
+        sa.Column("rule", sa.String(20), primary_key=True),
+        sa.Column("subject_id", sa.Integer, primary_key=True),
+        sa.Column("level", sa.String(20), nullable=False),
+        sa.Column("changed_at", sa.DateTime, nullable=False),
+        sa.Column("notified_at", sa.DateTime, nullable=False),
+    )
+
+    create_table(
+        "login_index",
+        sa.Column("email", sa.String(150), primary_key=True),
+        sa.Column("role", sa.String(20), primary_key=True),
+        sa.Column("account_id", sa.Integer, nullable=False),
+        sa.Column("password_hash", sa.String(255), nullable=False),
+        sa.Column("status", sa.Boolean, nullable=False),
+    )
+
+    create_table(
+        "organization_stats",
+        sa.Column("organization_id", sa.Integer, sa.ForeignKey(
+            "organization.organization_id", ondelete="CASCADE"),
+            primary_key=True),
+        sa.Column("total_requests", sa.Integer, nullable=False),
+        sa.Column("completed_requests", sa.Integer, nullable=False),
+        sa.Column("container_sites", sa.Integer, nullable=False),
+        sa.Column("containers", sa.Integer, nullable=False),
+        sa.Column("last_activity", sa.DateTime),
+        sa.Column("refreshed_at", sa.DateTime, nullable=False),
+    )
+
+    create_table(
+        "client_company_stats",
+        sa.Column("client_id", sa.Integer, sa.ForeignKey(
+            "clientcompanies.client_id", ondelete="CASCADE"),
+            primary_key=True),
+        sa.Column("total_requests", sa.Integer, nullable=False),
+        sa.Column("completed_requests", sa.Integer, nullable=False),
+        sa.Column("active_requests", sa.Integer, nullable=False),
+        sa.Column("last_activity", sa.DateTime),
+    )
+
+    create_table(
+        "site_fill_projections",
+        sa.Column("container_site_id", sa.Integer, sa.ForeignKey(
+            "containersite.container_site_id", ondelete="CASCADE"),
+            primary_key=True),
+        sa.Column("organization_id", sa.Integer),
+        sa.Column("due_at", sa.DateTime),
+        sa.Column("evaluated_at", sa.DateTime, nullable=False),
+    )
+    op.create_index(
+        "ix_site_fill_projections_organization_id",
+        "site_fill_projections", ["organization_id"], if_not_exists=True)
+    op.create_index(
+        "ix_site_fill_projections_due_at",
+        "site_fill_projections", ["due_at"], if_not_exists=True)
+
+
+def downgrade():
+    for table in (
+        "site_fill_projections",
+        "client_company_stats",
+        "organization_stats",
+        "login_index",
+        "alert_states",
+        "telemetry_rollups",
+        "telemetry_history",
+        "notification_cursors",
+        "notifications",
+        "disposal_requests",
+        "pickups",
+        "devices",
+        "containers",
+        "vehicles",
+        "containersite",
+        "admins",
+        "clientcompanies",
+        "users",
+        "organization",
+    ):
+        op.drop_table(table, if_exists=True)
@@ -0,0 +1,99 @@
+"""container site coordinates as double precision with geohash
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from src.services.geo import encode_geohash
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def parse(value) -> float | None:
+    try:
+        return float(str(value).strip().replace(",", "."))
+    except (TypeError, ValueError):
+        return None
+
+
+def upgrade():
+    bind = op.get_bind()
+    columns = {
+        c["name"]: c for c in sa.inspect(bind).get_columns("containersite")
+    }
+
+    if isinstance(columns["location_lat"]["type"], sa.String):
+        rows = bind.execute(sa.text(
+            "SELECT container_site_id, location_lat, location_lng "
+            "FROM containersite"
+        )).all()
+
+        invalid = []
+        for site_id, lat, lng in rows:
+            lat, lng = parse(lat), parse(lng)
+            if lat is None or lng is None or not -90 <= lat <= 90 or not -180 <= lng <= 180:
+                invalid.append(site_id)
+
+        if invalid:
+            raise RuntimeError(
+                "Invalid coordinates, fix these container sites first: "
+                + ", ".join(map(str, invalid))
+            )
+
+        for column in ("location_lat", "location_lng"):
+            op.alter_column(
+                "containersite",
+                column,
+                type_=sa.Float,
+                postgresql_using=(
+                    f"replace(trim({column}), ',', '.')::double precision"
+                )
+            )
+
+    if "geohash" not in columns:
+        op.add_column("containersite", sa.Column("geohash", sa.String(12)))
+
+    rows = bind.execute(sa.text(
+        "SELECT container_site_id, location_lat, location_lng "
+        "FROM containersite WHERE geohash IS NULL"
+    )).all()
+
+    if rows:
+        bind.execute(
+            sa.text(
+                "UPDATE containersite SET geohash = :geohash "
+                "WHERE container_site_id = :site_id"
+            ),
+            [
+                {"site_id": site_id, "geohash": encode_geohash(lat, lng)}
+                for site_id, lat, lng in rows
+            ]
+        )
+
+    op.create_index(
+        "ix_containersite_geohash",
+        "containersite",
+        ["geohash"],
+        postgresql_ops={"geohash": "varchar_pattern_ops"},
+        if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_index("ix_containersite_geohash", "containersite", if_exists=True)
+    op.drop_column("containersite", "geohash")
+
+    for column in ("location_lat", "location_lng"):
+        op.alter_column(
+            "containersite",
+            column,
+            type_=sa.String(100),
+            postgresql_using=f"{column}::text"
+        )
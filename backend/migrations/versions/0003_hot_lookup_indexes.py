@@ -0,0 +1,113 @@
+"""indexes for hot lookup columns and foreign keys
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# (назва, таблиця, колонки, додаткові параметри)
+INDEXES = [
+    ("ix_users_email", "users", ["email"], {}),
+    ("ix_users_city", "users", ["city"], {}),
+    ("ix_clientcompanies_email", "clientcompanies", ["email"], {}),
+    ("ix_clientcompanies_edrpou", "clientcompanies", ["edrpou"], {}),
+    ("ix_organization_email", "organization", ["email"], {}),
+    ("ix_admins_email", "admins", ["email"], {}),
+    ("ix_devices_serial_number", "devices", ["serial_number"], {"unique": True}),
+    ("ix_devices_container_id", "devices", ["container_id"], {}),
+    ("ix_containers_container_site_id", "containers", ["container_site_id"], {}),
+    ("ix_containersite_organization_id", "containersite", ["organization_id"], {}),
+    ("ix_vehicles_organization_id", "vehicles", ["organization_id"], {}),
+    ("ix_pickups_container_site_id", "pickups", ["container_site_id"], {}),
+    ("ix_pickups_scheduled_time", "pickups", ["scheduled_time"], {}),
+    ("ix_pickups_vehicle_scheduled", "pickups", ["vehicle_id", "scheduled_time"], {}),
+    ("ix_disposal_requests_organization_id", "disposal_requests", ["organization_id"], {}),
+    ("ix_disposal_requests_client_id", "disposal_requests", ["client_id"], {}),
+    ("ix_notifications_container_site_id", "notifications", ["container_site_id"], {}),
+    (
+        "ix_notifications_user_type_created",
+        "notifications",
+        ["user_id", "message_type", sa.text("created_at DESC")],
+        {}
+    ),
+    (
+        "ix_notifications_city_created",
+        "notifications",
+        ["city", sa.text("created_at DESC")],
+        {"postgresql_where": sa.text("user_id IS NULL")}
+    ),
+]
+
+
+def check_unique(bind, name: str, table: str, columns: list):
+    column_list = ", ".join(columns)
+    duplicates = bind.execute(sa.text(
+        f"SELECT {column_list}, count(*) FROM {table} "
+        f"GROUP BY {column_list} HAVING count(*) > 1 LIMIT 10"
+    )).all()
+
+    if duplicates:
+        raise RuntimeError(
+            f"Cannot create unique index {name}: {table} has duplicate "
+            f"({column_list}) values, e.g. "
+            + ", ".join(str(tuple(row[:-1])) for row in duplicates)
+            + ". Remove the duplicates and run the migration again."
+        )
+
+
+# Невдала побудова CONCURRENTLY лишає індекс INVALID, а if_not_exists
+# такий індекс пропустив би, тому його слід перебудувати
+def is_invalid(bind, name: str) -> bool:
+    return bool(bind.execute(sa.text(
+        "SELECT NOT i.indisvalid FROM pg_index i "
+        "JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = :name"
+    ), {"name": name}).scalar())
+
+
+def upgrade():
+    offline = op.get_context().as_sql
+    bind = None if offline else op.get_bind()
+
+    # CONCURRENTLY не блокує запис у таблиці, але не працює всередині транзакції
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in INDEXES:
+            if bind is not None:
+                if options.get("unique"):
+                    check_unique(bind, name, table, columns)
+
+                if is_invalid(bind, name):
+                    op.drop_index(
+                        name,
+                        table_name=table,
+                        postgresql_concurrently=True,
+                        if_exists=True
+                    )
+
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **options
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
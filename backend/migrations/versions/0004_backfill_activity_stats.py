@@ -0,0 +1,29 @@
+"""backfill activity stats
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+The stats tables are kept up to date by increments, which only start
+after deploy, so the historical totals are computed here once.
+
+"""
+from alembic import op
+
+from src.services.client_stats import refresh_client_stats
+from src.services.organization_stats import refresh_organization_stats
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    refresh_organization_stats(op.get_bind())
+    refresh_client_stats(op.get_bind())
+
+
+def downgrade():
+    # лічильники лишаються; їх перезапише наступна звірка
+    pass
@@ -0,0 +1,170 @@
+# Показує EXPLAIN для запитів ендпоінтів без індексів міграції 0003 і з ними.
+# Індекси видаляються всередині транзакції, яка потім відкочується, але на час
+# роботи скрипта таблиці блокуються, тому запускати його слід на staging-копії.
+# Запуск з каталогу backend:
+#   python -m scripts.explain_queries [--analyze]
+import argparse
+import importlib.util
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from src.database import engine
+from src.models import (
+    Admins,
+    ClientCompanies,
+    Containers,
+    ContainerSite,
+    Devices,
+    DisposalRequests,
+    Notifications,
+    Organization,
+    Pickups,
+    Users,
+)
+from src.services.notifications import user_notifications_query
+
+MIGRATION = (
+    Path(__file__).resolve().parent.parent
+    / "migrations" / "versions" / "0003_hot_lookup_indexes.py"
+)
+
+
+def migration_indexes() -> list[str]:
+    spec = importlib.util.spec_from_file_location("hot_lookup_indexes", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return [name for name, *_ in module.INDEXES]
+
+
+def sample(db: Session, column, default):
+    value = db.execute(
+        select(column).where(column.is_not(None)).limit(1)
+    ).scalar()
+    return default if value is None else value
+
+
+def endpoint_queries(db: Session) -> dict:
+    email = sample(db, Users.email, "user@example.com")
+    city = sample(db, Users.city, "Київ")
+    user_id = sample(db, Users.user_id, 1)
+    organization_id = sample(db, Organization.organization_id, 1)
+    client_id = sample(db, ClientCompanies.client_id, 1)
+    site_id = sample(db, ContainerSite.container_site_id, 1)
+    vehicle_id = sample(db, Pickups.vehicle_id, 1)
+    today = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+
+    user = SimpleNamespace(user_id=user_id, city=city)
+
+    return {
+        "POST /auth/register (user email check)":
+            select(Users).where(Users.email == email),
+        "POST /auth/register (client email check)":
+            select(ClientCompanies).where(
+                ClientCompanies.email == sample(db, ClientCompanies.email, email)),
+        "client company by edrpou":
+            select(ClientCompanies).where(
+                ClientCompanies.edrpou == sample(db, ClientCompanies.edrpou, "0")),
+        "organization by email":
+            select(Organization).where(
+                Organization.email == sample(db, Organization.email, email)),
+        "admin by email":
+            select(Admins).where(Admins.email == sample(db, Admins.email, email)),
+        "residents of a city":
+            select(Users.user_id).where(Users.city == city),
+        "POST /devices/telemetry (serial lookup)":
+            select(Devices).where(
+                Devices.serial_number == sample(db, Devices.serial_number, "SN")),
+        "GET /users/notifications":
+            user_notifications_query(db, user, "INFO")
+            .order_by(Notifications.created_at.desc())
+            .limit(50)
+            .statement,
+        "GET /organizations/{id}/notifications":
+            select(Notifications)
+            .join(ContainerSite,
+                  Notifications.container_site_id == ContainerSite.container_site_id)
+            .where(ContainerSite.organization_id == organization_id)
+            .order_by(Notifications.created_at.desc(),
+                      Notifications.notification_id.desc())
+            .limit(50),
+        "GET /container-sites/{id}/containers":
+            select(Containers).where(Containers.container_site_id == site_id),
+        "GET /containers (organization)":
+            select(Containers)
+            .join(ContainerSite)
+            .where(ContainerSite.organization_id == organization_id)
+            .order_by(Containers.container_id)
+            .limit(50),
+        "GET /pickups (organization)":
+            select(Pickups)
+            .join(ContainerSite)
+            .where(ContainerSite.organization_id == organization_id)
+            .order_by(Pickups.pickup_id)
+            .limit(50),
+        "GET /pickups/routes":
+            select(Pickups)
+            .where(Pickups.scheduled_time >= today,
+                   Pickups.scheduled_time < today + timedelta(days=1)),
+        "pickup scheduler vehicle load":
+            select(Pickups)
+            .where(Pickups.vehicle_id == vehicle_id,
+                   Pickups.scheduled_time >= today),
+        "GET /requests (organization)":
+            select(DisposalRequests)
+            .where(DisposalRequests.organization_id == organization_id)
+            .order_by(DisposalRequests.request_id)
+            .limit(50),
+        "GET /requests (client company)":
+            select(DisposalRequests)
+            .where(DisposalRequests.client_id == client_id)
+            .order_by(DisposalRequests.request_id)
+            .limit(50),
+    }
+
+
+def explain(connection, statement, analyze: bool) -> str:
+    compiled = statement.compile(dialect=connection.dialect)
+    prefix = "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+    rows = connection.exec_driver_sql(prefix + str(compiled), compiled.params)
+    return "\n".join(row[0] for row in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--analyze", action="store_true",
+                        help="run EXPLAIN ANALYZE (executes the queries)")
+    args = parser.parse_args()
+
+    with Session(engine) as db:
+        queries = endpoint_queries(db)
+
+    plans = {}
+
+    with engine.connect() as connection:
+        with connection.begin() as transaction:
+            for index in migration_indexes():
+                connection.execute(text(f'DROP INDEX IF EXISTS "{index}"'))
+
+            for name, statement in queries.items():
+                plans[name] = [explain(connection, statement, args.analyze)]
+
+            transaction.rollback()
+
+        for name, statement in queries.items():
+            plans[name].append(explain(connection, statement, args.analyze))
+
+    for name, (before, after) in plans.items():
+        print(f"=== {name}")
+        print("--- before")
+        print(before)
+        print("--- after")
+        print(after)
+        print()
+
+
+if __name__ == "__main__":
+    main()
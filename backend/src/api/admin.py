@@ -17,10 +17,19 @@ from src.models.users import Users
 from src.schemas.users import UserResponse
 from src.database import get_db
 from src.api.auth import get_current_user, only_admin
+from src.api.pagination import PageParams, paginate
+from src.schemas.pagination import Page
+from src.schemas.containers import NotificationResponse
 from src.models.admin import Admins
 from src.schemas.auth import Token, MeResponse, StatusUpdate
 from src.schemas.admin import AdminCreate, AdminResponse, AdminUpdate
 from src.api.core import verify_password, hash_password, create_access_token, SECRET_KEY, ALGORITHM
+from src.services.identity_cache import identity_cache
+from src.services.jobs import job_registry
+from src.services.login_index import rebuild_login_index
+from src.services.client_stats import reconcile_client_stats
+from src.services.organization_stats import reconcile_organization_stats
+from src.schemas.jobs import JobResponse
 
 
 router = APIRouter(
@@ -32,8 +41,9 @@ router = APIRouter(
 
 
 # GET: отримати всіх користувачів
-@router.get("/users", response_model=list[UserResponse])
+@router.get("/users", response_model=Page[UserResponse])
 def get_all_users(
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current=Depends(get_current_user)
 ):
@@ -45,7 +55,7 @@ def get_all_users(
             detail="Only admin can view all users"
         )
 
-    return db.query(Users).all()
+    return paginate(db.query(Users), page, Users.user_id)
 
 
 @router.patch("/users/{user_id}/status")
@@ -66,6 +76,8 @@ def patch_user_status(
     user.status = data.status
     db.commit()
 
+    identity_cache.invalidate("user", user_id)
+
     return {
         "message": "Status updated",
         "user_id": user_id,
@@ -94,13 +106,16 @@ def delete_user(
     db.delete(user)
     db.commit()
 
+    identity_cache.invalidate("user", user_id)
+
 
 # Client Company Management Endpoints
 
 
 # GET: отримати всі компанії-клієнти
-@router.get("/client-companies", response_model=list[ClientCompanyResponse])
+@router.get("/client-companies", response_model=Page[ClientCompanyResponse])
 def get_all_client_companies(
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current=Depends(get_current_user)
 ):
@@ -109,7 +124,7 @@ def get_all_client_companies(
     if role != "admin":
         raise HTTPException(403, "Only admin can view all client companies")
 
-    return db.query(ClientCompanies).all()
+    return paginate(db.query(ClientCompanies), page, ClientCompanies.client_id)
 
 
 @router.patch("/client-companies/{client_id}/status")
@@ -133,6 +148,8 @@ def patch_client_company_status(
     company.status = data.status
     db.commit()
 
+    identity_cache.invalidate("client_company", client_id)
+
     return {
         "message": "Status updated",
         "client_id": client_id,
@@ -162,6 +179,8 @@ def delete_client_company(
     db.delete(company)
     db.commit()
 
+    identity_cache.invalidate("client_company", client_id)
+
 # Organization Management Endpoints
 
 
@@ -229,6 +248,8 @@ def patch_organization_status(
     org.status = data.status
     db.commit()
 
+    identity_cache.invalidate("organization", organization_id)
+
     return {
         "message": "Status updated",
         "organization_id": organization_id,
@@ -266,12 +287,67 @@ def delete_organization(
     db.delete(org)
     db.commit()
 
+    identity_cache.invalidate("organization", organization_id)
+
+
+@router.post(
+    "/login-index/rebuild",
+    response_model=JobResponse,
+    status_code=202,
+    summary="Rebuild login index from account tables"
+)
+def rebuild_login_index_job(
+    current=Depends(get_current_user)
+):
+    _, role = current
+    if role != "admin":
+        raise HTTPException(403, "Only admin can rebuild login index")
+
+    return job_registry.submit("login_index_rebuild", rebuild_login_index)
+
+
+@router.post(
+    "/client-stats/reconcile",
+    response_model=JobResponse,
+    status_code=202,
+    summary="Rebuild client company counters and report drift"
+)
+def reconcile_client_stats_job(
+    current=Depends(get_current_user)
+):
+    _, role = current
+    if role != "admin":
+        raise HTTPException(403, "Only admin can reconcile client stats")
+
+    return job_registry.submit("client_stats_reconcile", reconcile_client_stats)
+
+
+@router.post(
+    "/organization-stats/reconcile",
+    response_model=JobResponse,
+    status_code=202,
+    summary="Recompute organization activity stats"
+)
+def reconcile_organization_stats_job(
+    current=Depends(get_current_user)
+):
+    _, role = current
+    if role != "admin":
+        raise HTTPException(403, "Only admin can reconcile organization stats")
+
+    return job_registry.submit(
+        "organization_stats_reconcile",
+        reconcile_organization_stats
+    )
+
 
 @router.get(
     "/admin/notifications",
+    response_model=Page[NotificationResponse],
     summary="View all notifications"
 )
 def get_notifications(
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current=Depends(get_current_user)
 ):
@@ -279,10 +355,12 @@ def get_notifications(
     if role != "admin":
         raise HTTPException(403, "Only admin can view notifications")
 
-    return (
-        db.query(Notifications)
-        .order_by(Notifications.created_at.desc())
-        .all()
+    return paginate(
+        db.query(Notifications),
+        page,
+        Notifications.created_at,
+        Notifications.notification_id,
+        descending=True
     )
 
 
@@ -2,11 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
-from src.models import Organization, ContainerSite, Containers
+from src.models import Organization, OrganizationStats
 from src.schemas.analytics import ClientCompanyActivityStats, OrganizationActivityStats
-from src.database import get_db
-from src.models import ClientCompanies, DisposalRequests
+from src.services.replicas import get_read_db
+from src.models import ClientCompanies, ClientCompanyStats
 from src.api.auth import get_current_user
+from src.services import organization_stats  # noqa: F401 (реєструє оновлення статистики)
 
 router = APIRouter(
     prefix="/analytics",
@@ -19,7 +20,7 @@ router = APIRouter(
     response_model=list[ClientCompanyActivityStats]
 )
 def client_companies_activity_statistic(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current=Depends(get_current_user)
 ):
     _, role = current
@@ -30,20 +31,19 @@ def client_companies_activity_statistic(
         db.query(
             ClientCompanies.client_id,
             ClientCompanies.name,
-            func.count(DisposalRequests.request_id).label("total_requests"),
-            func.count(
-                func.nullif(DisposalRequests.status != "completed", True)
-            ).label("completed_requests"),
-            func.count(
-                func.nullif(DisposalRequests.status == "completed", True)
-            ).label("active_requests"),
-            func.max(DisposalRequests.created_at).label("last_activity")
+            func.coalesce(ClientCompanyStats.total_requests, 0)
+                .label("total_requests"),
+            func.coalesce(ClientCompanyStats.completed_requests, 0)
+                .label("completed_requests"),
+            func.coalesce(ClientCompanyStats.active_requests, 0)
+                .label("active_requests"),
+            ClientCompanyStats.last_activity
         )
         .outerjoin(
-            DisposalRequests,
-            DisposalRequests.client_id == ClientCompanies.client_id
+            ClientCompanyStats,
+            ClientCompanyStats.client_id == ClientCompanies.client_id
         )
-        .group_by(ClientCompanies.client_id)
+        .order_by(ClientCompanies.client_id)
         .all()
     )
 
@@ -55,7 +55,7 @@ def client_companies_activity_statistic(
     response_model=list[OrganizationActivityStats]
 )
 def organizations_activity_statistic(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current=Depends(get_current_user)
 ):
     _, role = current
@@ -66,29 +66,21 @@ def organizations_activity_statistic(
         db.query(
             Organization.organization_id,
             Organization.name,
-            func.count(DisposalRequests.request_id).label("total_requests"),
-            func.count(
-                func.nullif(DisposalRequests.status != "completed", True)
-            ).label("completed_requests"),
-            func.count(func.distinct(ContainerSite.container_site_id))
+            func.coalesce(OrganizationStats.total_requests, 0)
+                .label("total_requests"),
+            func.coalesce(OrganizationStats.completed_requests, 0)
+                .label("completed_requests"),
+            func.coalesce(OrganizationStats.container_sites, 0)
                 .label("container_sites"),
-            func.count(func.distinct(Containers.container_id))
+            func.coalesce(OrganizationStats.containers, 0)
                 .label("containers"),
-            func.max(DisposalRequests.updated_at).label("last_activity")
+            OrganizationStats.last_activity
         )
         .outerjoin(
-            DisposalRequests,
-            DisposalRequests.organization_id == Organization.organization_id
+            OrganizationStats,
+            OrganizationStats.organization_id == Organization.organization_id
         )
-        .outerjoin(
-            ContainerSite,
-            ContainerSite.organization_id == Organization.organization_id
-        )
-        .outerjoin(
-            Containers,
-            Containers.container_site_id == ContainerSite.container_site_id
-        )
-        .group_by(Organization.organization_id)
+        .order_by(Organization.organization_id)
         .all()
     )
 
@@ -1,17 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import jwt, JWTError
 from typing import Optional
 
-from src.database import get_db
+from src.database import get_async_db
 from src.models.admin import Admins
 from src.models.users import Users
 from src.models.client_companies import ClientCompanies
 from src.models.organization import Organization
 from src.schemas.auth import Token, MeResponse
 from src.schemas.users import UserResponse
-from src.api.core import verify_password, hash_password, create_access_token, SECRET_KEY, ALGORITHM, oauth2_scheme
+from src.api.core import verify_password_async, create_access_token, SECRET_KEY, ALGORITHM, oauth2_scheme
+from src.services.identity_cache import identity_cache
+from src.services.login_index import find_login
 
 
 router = APIRouter(
@@ -19,79 +21,55 @@ router = APIRouter(
     tags=["Authentication 🔐"]
 )
 
+BLOCKED_MESSAGES = {
+    "user": "User account is blocked",
+    "client_company": "Client company account is blocked",
+    "organization": "Organization account is blocked",
+    "admin": "Admin account is blocked",
+}
+
+IDENTITY_MODELS = {
+    "user": Users,
+    "client_company": ClientCompanies,
+    "organization": Organization,
+    "admin": Admins,
+}
+
 # Логін і отримання JWT токена
 
 
 @router.post("/login", response_model=Token, summary="Login and get JWT token")
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    email = form_data.username
-
-    user = db.query(Users).filter(Users.email == email).first()
-    if user and verify_password(form_data.password, user.password_hash):
-
-        if not user.status:
-            raise HTTPException(
-                status_code=403,
-                detail="User account is blocked"
-            )
-
-        token = create_access_token({
-            "sub": str(user.user_id),
-            "role": "user"
-        })
-        return {"access_token": token, "token_type": "bearer"}
-
-    company = db.query(ClientCompanies).filter(
-        ClientCompanies.email == email
-    ).first()
-    if company and verify_password(form_data.password, company.password_hash):
-
-        if not company.status:
-            raise HTTPException(
-                status_code=403,
-                detail="Client company account is blocked"
-            )
-
-        token = create_access_token({
-            "sub": str(company.client_id),
-            "role": "client_company"
-        })
-        return {"access_token": token, "token_type": "bearer"}
-
-    organization = db.query(Organization).filter(
-        Organization.email == email
-    ).first()
-    if organization and verify_password(form_data.password, organization.password_hash):
-
-        if not organization.status:
-            raise HTTPException(
-                status_code=403,
-                detail="Organization account is blocked"
-            )
-
-        token = create_access_token({
-            "sub": str(organization.organization_id),
-            "role": "organization"
-        })
-        return {"access_token": token, "token_type": "bearer"}
-
-    admin = db.query(Admins).filter(Admins.email == email).first()
-    if admin and verify_password(form_data.password, admin.password_hash):
-        token = create_access_token({
-            "sub": str(admin.admin_id),
-            "role": "admin"
-        })
-        return {"access_token": token, "token_type": "bearer"}
-
-    raise HTTPException(status_code=401, detail="Incorrect email or password")
-
-
-def get_current_user(
+    entry = await db.run_sync(find_login, form_data.username)
+
+    if not entry or not await verify_password_async(
+        form_data.password,
+        entry.password_hash
+    ):
+        raise HTTPException(
+            status_code=401,
+            detail="Incorrect email or password"
+        )
+
+    if not entry.status:
+        raise HTTPException(
+            status_code=403,
+            detail=BLOCKED_MESSAGES[entry.role]
+        )
+
+    token = create_access_token({
+        "sub": str(entry.account_id),
+        "role": entry.role
+    })
+    return {"access_token": token, "token_type": "bearer"}
+
+
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     cred_exc = HTTPException(
         status_code=401,
@@ -110,31 +88,19 @@ def get_current_user(
     except JWTError:
         raise cred_exc
 
-    if role == "user":
-        identity = db.query(Users).filter(
-            Users.user_id == int(entity_id)
-        ).first()
-
-    elif role == "client_company":
-        identity = db.query(ClientCompanies).filter(
-            ClientCompanies.client_id == int(entity_id)
-        ).first()
+    model = IDENTITY_MODELS.get(role)
+    if model is None:
+        raise cred_exc
 
-    elif role == "organization":
-        identity = db.query(Organization).filter(
-            Organization.organization_id == int(entity_id)
-        ).first()
+    identity = identity_cache.get(role, int(entity_id))
 
-    elif role == "admin":
-        identity = db.query(Admins).filter(
-            Admins.admin_id == int(entity_id)
-        ).first()
+    if identity is None:
+        entity = await db.get(model, int(entity_id))
 
-    else:
-        raise cred_exc
+        if not entity:
+            raise cred_exc
 
-    if not identity:
-        raise cred_exc
+        identity = identity_cache.put(role, int(entity_id), entity)
 
     return identity, role
 
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.database import get_db
+from src.database import get_async_db, get_db
 from src.api.auth import get_current_user
 from src.models.client_companies import ClientCompanies
 from src.schemas.client_companies import (
@@ -9,7 +11,8 @@ from src.schemas.client_companies import (
     ClientCompanyResponse,
     ClientCompanyUpdate
 )
-from src.api.core import hash_password
+from src.api.core import hash_password, hash_password_async
+from src.services.identity_cache import identity_cache
 
 
 router = APIRouter(
@@ -19,13 +22,13 @@ router = APIRouter(
 
 
 @router.post("/register", status_code=201)
-def register_client_company(
+async def register_client_company(
     data: ClientCompanyCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    existing_email = db.query(ClientCompanies).filter(
-        ClientCompanies.email == data.email
-    ).first()
+    existing_email = await db.scalar(
+        select(ClientCompanies).where(ClientCompanies.email == data.email)
+    )
 
     if existing_email:
         raise HTTPException(
@@ -33,9 +36,9 @@ def register_client_company(
             detail=" A company with this email already exists."
         )
 
-    existing_edrpou = db.query(ClientCompanies).filter(
-        ClientCompanies.edrpou == data.edrpou
-    ).first()
+    existing_edrpou = await db.scalar(
+        select(ClientCompanies).where(ClientCompanies.edrpou == data.edrpou)
+    )
 
     if existing_edrpou:
         raise HTTPException(
@@ -43,7 +46,7 @@ def register_client_company(
             detail=" A company with this EDRPOU already exists."
         )
 
-    hashed_password = hash_password(data.password)
+    hashed_password = await hash_password_async(data.password)
 
     new_company = ClientCompanies(
         name=data.name,
@@ -58,8 +61,8 @@ def register_client_company(
     )
 
     db.add(new_company)
-    db.commit()
-    db.refresh(new_company)
+    await db.commit()
+    await db.refresh(new_company)
 
     return {"message": "Client company registered successfully", "client_id": new_company.client_id}
 
@@ -148,4 +151,6 @@ def update_client_company(
     db.commit()
     db.refresh(company)
 
+    identity_cache.invalidate("client_company", client_id)
+
     return company
@@ -1,21 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import math
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import exists
 from sqlalchemy.orm import selectinload
 
-from src.models.users import Users
-from src.models.notifications import Notifications
 from src.models.pickups import Pickups
 from src.api.auth import get_current_user
+from src.api.pagination import PageParams, paginate
+from src.schemas.pagination import Page
+from src.services.notifications import broadcast_city_notification
+from src.services.geo import bounding_box, covering_prefixes, haversine_m
 from src.models.organization import Organization
 from src.models.containers import Containers
 from src.database import get_db
+from src.services.replicas import get_read_db
 from src.models.container_sites import ContainerSite
 from src.schemas.container_sites import (
     ContainerSiteCreate,
     ContainerSiteUpdate,
     ContainerSiteResponse,
-    ContainerStatusResponse
+    ContainerStatusResponse,
+    NearbyContainerSiteResponse
 )
 
 router = APIRouter(
@@ -23,6 +30,8 @@ router = APIRouter(
     tags=["Container Sites 📍"]
 )
 
+NEARBY_CANDIDATE_FACTOR = 2
+
 
 @router.post(
     "/",
@@ -55,54 +64,128 @@ def create_container_site(
 
     site = ContainerSite(**data.dict())
     db.add(site)
-    db.commit()
-    db.refresh(site)
-
-    users = (
-        db.query(Users)
-        .filter(Users.city == site.city)
-        .all()
-    )
-
-    notifications = [
-        Notifications(
-            user_id=user.user_id,
-            container_site_id=site.container_site_id,
-            message=(
+    db.flush()
+
+    if site.city:
+        broadcast_city_notification(
+            db,
+            site.city,
+            site.container_site_id,
+            "new_container_site",
+            (
                 f"У вашому місті відкрито новий контейнерний майданчик "
                 f"за адресою {site.street} {site.building}"
-            ),
-            message_type="new_container_site"
+            )
         )
-        for user in users
-    ]
 
-    db.add_all(notifications)
     db.commit()
+    db.refresh(site)
 
     return site
 
 
 @router.get(
     "/",
-    response_model=list[ContainerSiteResponse]
+    response_model=Page[ContainerSiteResponse]
 )
 def get_container_sites(
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current=Depends(get_current_user)
 ):
-    if not current:
-        return db.query(ContainerSite).all()
+    query = db.query(ContainerSite)
 
-    entity, role = current
+    if current:
+        entity, role = current
 
-    if role != "organization":
-        return db.query(ContainerSite).all()
-    return (
-        db.query(ContainerSite)
-        .filter(ContainerSite.organization_id == entity.organization_id)
+        if role == "organization":
+            query = query.filter(
+                ContainerSite.organization_id == entity.organization_id
+            )
+
+    return paginate(query, page, ContainerSite.container_site_id)
+
+
+@router.get(
+    "/nearby",
+    response_model=list[NearbyContainerSiteResponse],
+    summary="Container sites within a radius, nearest first"
+)
+def get_nearby_container_sites(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius: float = Query(1000, gt=0, le=50000, description="meters"),
+    waste_type: str | None = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current=Depends(get_current_user)
+):
+    prefixes = covering_prefixes(lat, lng, radius)
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius)
+
+    query = db.query(ContainerSite).filter(
+        or_(*(ContainerSite.geohash.startswith(p) for p in prefixes)),
+        ContainerSite.location_lat.between(min_lat, max_lat)
+    )
+
+    if min_lng is not None and min_lng <= max_lng:
+        query = query.filter(ContainerSite.location_lng.between(min_lng, max_lng))
+    elif min_lng is not None:
+        query = query.filter(or_(
+            ContainerSite.location_lng >= min_lng,
+            ContainerSite.location_lng <= max_lng
+        ))
+
+    if waste_type:
+        query = query.filter(
+            exists().where(
+                Containers.container_site_id ==
+                ContainerSite.container_site_id,
+                Containers.type == waste_type
+            )
+        )
+
+    # наближена (рівнокутна) відстань для порядку в SQL; точна рахується нижче,
+    # тому кандидатів береться із запасом
+    scale = math.cos(math.radians(lat))
+    approx_distance = (
+        (ContainerSite.location_lat - lat) * (ContainerSite.location_lat - lat)
+        + (ContainerSite.location_lng - lng) * (ContainerSite.location_lng - lng)
+        * scale * scale
+    )
+
+    sites = (
+        query
+        .order_by(approx_distance)
+        .limit(limit * NEARBY_CANDIDATE_FACTOR)
         .all()
     )
+    if not sites:
+        return []
+
+    distances = haversine_m(
+        lat,
+        lng,
+        [site.location_lat for site in sites],
+        [site.location_lng for site in sites]
+    )
+
+    nearby = sorted(
+        (
+            (float(distance), site)
+            for distance, site in zip(distances, sites)
+            if distance <= radius
+        ),
+        key=lambda item: item[0]
+    )
+
+    return [
+        NearbyContainerSiteResponse(
+            **ContainerSiteResponse.model_validate(site).model_dump(),
+            distance_m=round(distance, 1)
+        )
+        for distance, site in nearby[:limit]
+    ]
 
 
 @router.get(
@@ -227,7 +310,7 @@ def delete_container_site(
 )
 def get_containers_by_site(
     container_site_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     site = db.query(ContainerSite).filter(
         ContainerSite.container_site_id == container_site_id
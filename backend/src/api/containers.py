@@ -1,16 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models.users import Users
-from src.database import get_db
+from src.database import get_async_db
 from src.models.containers import Containers
 from src.models.container_sites import ContainerSite
+from src.models.telemetry import TelemetryHistory, TelemetryRollups
 from src.schemas.containers import (
     ContainerCreate,
     ContainerUpdate,
     ContainerResponse,
+    TelemetryHistoryPoint,
+    ContainerForecast,
 )
+from src.services.telemetry_history import BUCKET_5M, BUCKET_1H
+from src.services.device_bindings import invalidate_container
+from src.services.forecast import forecast_containers
 from src.api.auth import get_current_user
+from src.api.pagination import PageParams, paginate_async
+from src.schemas.pagination import Page
 
 router = APIRouter(
     prefix="/containers",
@@ -18,10 +28,24 @@ router = APIRouter(
 )
 
 
+# контейнер разом з організацією його майданчика
+async def container_with_owner(db: AsyncSession, container_id: int):
+    row = (await db.execute(
+        select(Containers, ContainerSite.organization_id)
+        .join(ContainerSite)
+        .where(Containers.container_id == container_id)
+    )).first()
+
+    if not row:
+        raise HTTPException(404, "Container not found")
+
+    return row
+
+
 @router.post("/", response_model=ContainerResponse, status_code=201)
-def create_container(
+async def create_container(
     data: ContainerCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current=Depends(get_current_user)
 ):
     entity, role = current
@@ -29,9 +53,7 @@ def create_container(
     if role not in ("admin", "organization"):
         raise HTTPException(403, "Access denied")
 
-    site = db.query(ContainerSite).filter(
-        ContainerSite.container_site_id == data.container_site_id
-    ).first()
+    site = await db.get(ContainerSite, data.container_site_id)
 
     if not site:
         raise HTTPException(404, "Container site not found")
@@ -45,48 +67,77 @@ def create_container(
     container = Containers(**data.dict())
 
     db.add(container)
-    db.commit()
-    db.refresh(container)
+    await db.commit()
+    await db.refresh(container)
 
     return container
 
 
-@router.get("/", response_model=list[ContainerResponse])
-def get_containers(
-    db: Session = Depends(get_db),
+@router.get("/", response_model=Page[ContainerResponse])
+async def get_containers(
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     current=Depends(get_current_user)
 ):
-    if not current:
-        return db.query(Containers).all()
+    statement = select(Containers)
 
-    entity, role = current
+    if current:
+        entity, role = current
 
-    if role != "organization":
-        return db.query(Containers).all()
+        if role == "organization":
+            statement = statement.join(ContainerSite).where(
+                ContainerSite.organization_id == entity.organization_id
+            )
 
-    return (
-        db.query(Containers)
-        .join(ContainerSite)
-        .filter(ContainerSite.organization_id == entity.organization_id)
-        .all()
+    return await paginate_async(db, statement, page, Containers.container_id)
+
+
+def forecast_source():
+    return select(
+        Containers.container_id,
+        Containers.fill_level,
+        Containers.last_update
     )
 
 
+@router.get(
+    "/forecast",
+    response_model=list[ContainerForecast],
+    summary="Estimated time until containers are full"
+)
+async def get_containers_forecast(
+    organization_id: int | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current=Depends(get_current_user)
+):
+    entity, role = current
+
+    if role == "organization":
+        organization_id = entity.organization_id
+    elif role != "admin":
+        raise HTTPException(403, "Access denied")
+
+    statement = forecast_source()
+
+    if organization_id is not None:
+        statement = statement.join(ContainerSite).where(
+            ContainerSite.organization_id == organization_id
+        )
+
+    containers = (await db.execute(
+        statement.order_by(Containers.container_id)
+    )).all()
+
+    return await db.run_sync(forecast_containers, containers)
+
+
 @router.get("/{container_id}", response_model=ContainerResponse)
-def get_container(
+async def get_container(
     container_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current=Depends(get_current_user)
 ):
-    container = (
-        db.query(Containers)
-        .join(ContainerSite)
-        .filter(Containers.container_id == container_id)
-        .first()
-    )
-
-    if not container:
-        raise HTTPException(404, "Container not found")
+    container, organization_id = await container_with_owner(db, container_id)
 
     if not current:
         return container
@@ -96,17 +147,17 @@ def get_container(
     if role != "organization":
         return container
 
-    if container.site.organization_id != entity.organization_id:
+    if organization_id != entity.organization_id:
         raise HTTPException(403, "Access denied")
 
     return container
 
 
 @router.put("/{container_id}", response_model=ContainerResponse)
-def update_container(
+async def update_container(
     container_id: int,
     data: ContainerUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current=Depends(get_current_user)
 ):
     entity, role = current
@@ -114,26 +165,15 @@ def update_container(
     if role not in ("admin", "organization"):
         raise HTTPException(403, "Access denied")
 
-    container = (
-        db.query(Containers)
-        .join(ContainerSite)
-        .filter(Containers.container_id == container_id)
-        .first()
-    )
+    container, organization_id = await container_with_owner(db, container_id)
 
-    if not container:
-        raise HTTPException(404, "Container not found")
-
-    if role == "organization" and \
-       container.site.organization_id != entity.organization_id:
+    if role == "organization" and organization_id != entity.organization_id:
         raise HTTPException(403, "Access denied")
 
     update_data = data.dict(exclude_unset=True)
 
     if "container_site_id" in update_data:
-        site = db.query(ContainerSite).filter(
-            ContainerSite.container_site_id == update_data["container_site_id"]
-        ).first()
+        site = await db.get(ContainerSite, update_data["container_site_id"])
 
         if not site:
             raise HTTPException(404, "Container site not found")
@@ -147,16 +187,19 @@ def update_container(
     for field, value in update_data.items():
         setattr(container, field, value)
 
-    db.commit()
-    db.refresh(container)
+    await db.commit()
+    await db.refresh(container)
+
+    if "container_site_id" in update_data:
+        invalidate_container(container_id)
 
     return container
 
 
 @router.delete("/{container_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_container(
+async def delete_container(
     container_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current=Depends(get_current_user)
 ):
     entity, role = current
@@ -164,19 +207,131 @@ def delete_container(
     if role not in ("admin", "organization"):
         raise HTTPException(403, "Access denied")
 
-    container = (
-        db.query(Containers)
+    container, organization_id = await container_with_owner(db, container_id)
+
+    if role == "organization" and organization_id != entity.organization_id:
+        raise HTTPException(403, "Access denied")
+
+    await db.delete(container)
+    await db.commit()
+
+    invalidate_container(container_id)
+
+
+@router.get(
+    "/{container_id}/forecast",
+    response_model=ContainerForecast,
+    summary="Estimated time until the container is full"
+)
+async def get_container_forecast(
+    container_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current=Depends(get_current_user)
+):
+    entity, role = current
+
+    if role not in ("admin", "organization"):
+        raise HTTPException(403, "Access denied")
+
+    container = (await db.execute(
+        forecast_source()
+        .add_columns(ContainerSite.organization_id)
         .join(ContainerSite)
-        .filter(Containers.container_id == container_id)
-        .first()
-    )
+        .where(Containers.container_id == container_id)
+    )).first()
 
     if not container:
         raise HTTPException(404, "Container not found")
 
-    if role == "organization" and \
-       container.site.organization_id != entity.organization_id:
+    if role == "organization" and container.organization_id != entity.organization_id:
+        raise HTTPException(403, "Access denied")
+
+    forecasts = await db.run_sync(forecast_containers, [container])
+    return forecasts[0]
+
+
+@router.get(
+    "/{container_id}/history",
+    response_model=list[TelemetryHistoryPoint],
+    summary="Container telemetry history"
+)
+async def get_container_history(
+    container_id: int,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    resolution: Literal["raw", "5m", "1h"] = "1h",
+    limit: int = Query(1000, ge=1, le=10000),
+    db: AsyncSession = Depends(get_async_db),
+    current=Depends(get_current_user)
+):
+    entity, role = current
+
+    if role not in ("admin", "organization"):
+        raise HTTPException(403, "Access denied")
+
+    site = await db.scalar(
+        select(ContainerSite)
+        .join(Containers)
+        .where(Containers.container_id == container_id)
+    )
+
+    if not site:
+        raise HTTPException(404, "Container not found")
+
+    if role == "organization" and site.organization_id != entity.organization_id:
         raise HTTPException(403, "Access denied")
 
-    db.delete(container)
-    db.commit()
+    date_to = date_to or datetime.utcnow()
+    date_from = date_from or date_to - timedelta(days=1)
+
+    if resolution == "raw":
+        readings = (await db.scalars(
+            select(TelemetryHistory)
+            .where(
+                TelemetryHistory.container_id == container_id,
+                TelemetryHistory.recorded_at >= date_from,
+                TelemetryHistory.recorded_at < date_to
+            )
+            .order_by(TelemetryHistory.recorded_at)
+            .limit(limit)
+        )).all()
+
+        return [
+            {
+                "timestamp": r.recorded_at,
+                "samples": 1,
+                "min_fill": r.fill_level,
+                "max_fill": r.fill_level,
+                "avg_fill": r.fill_level,
+                "max_temperature": r.temperature,
+                "tilt_count": int(bool(r.tilted))
+            }
+            for r in readings
+        ]
+
+    bucket_seconds = BUCKET_5M if resolution == "5m" else BUCKET_1H
+
+    rollups = (await db.scalars(
+        select(TelemetryRollups)
+        .where(
+            TelemetryRollups.container_id == container_id,
+            TelemetryRollups.bucket_seconds == bucket_seconds,
+            TelemetryRollups.bucket_start >= date_from,
+            TelemetryRollups.bucket_start < date_to
+        )
+        .order_by(TelemetryRollups.bucket_start)
+        .limit(limit)
+    )).all()
+
+    return [
+        {
+            "timestamp": r.bucket_start,
+            "samples": r.samples,
+            "min_fill": r.min_fill,
+            "max_fill": r.max_fill,
+            "avg_fill": r.avg_fill,
+            "max_temperature": r.max_temperature,
+            "tilt_count": r.tilt_count
+        }
+        for r in rollups
+    ]
@@ -1,4 +1,9 @@
+import asyncio
+import multiprocessing
 import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from fastapi import Depends, HTTPException
 from jose import JWTError, jwt
@@ -9,18 +14,179 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60))
 
+# 0 робочих процесів означає хешування в окремому потоці (без process pool)
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 64))
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def hash_password(password: str) -> str:
+def _hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def verify_password(plain: str, hashed: str) -> bool:
+def _verify(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+def _timed(func, *args):
+    started_at = time.time()
+    result = func(*args)
+    return result, started_at, time.time() - started_at
+
+
+class PasswordPoolBusy(Exception):
+    pass
+
+
+# Обмежений пул для bcrypt: робота з паролями не займає потоки,
+# які обслуговують інші ендпоінти, а черга має верхню межу
+class PasswordPool:
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "pending": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+            "run_seconds_total": 0.0,
+        }
+
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                if self.workers > 0:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=1,
+                        thread_name_prefix="password"
+                    )
+            return self._executor
+
+    def submit(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise PasswordPoolBusy()
+
+        submitted_at = time.time()
+
+        with self._lock:
+            self._stats["submitted"] += 1
+            self._stats["pending"] += 1
+
+        try:
+            future = self.executor().submit(_timed, func, *args)
+        except Exception:
+            self._release()
+            raise
+
+        future.add_done_callback(
+            lambda done: self._finished(done, submitted_at)
+        )
+        return future
+
+    def run(self, func, *args):
+        result, _, _ = self.submit(func, *args).result()
+        return result
+
+    async def run_async(self, func, *args):
+        result, _, _ = await asyncio.wrap_future(self.submit(func, *args))
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+
+        finished = stats["completed"] or 1
+        stats["workers"] = self.workers
+        stats["max_pending"] = self.max_pending
+        stats["wait_seconds_avg"] = stats["wait_seconds_total"] / finished
+        stats["run_seconds_avg"] = stats["run_seconds_total"] / finished
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _release(self):
+        with self._lock:
+            self._stats["pending"] -= 1
+        self._slots.release()
+
+    def _finished(self, future, submitted_at: float):
+        self._release()
+
+        with self._lock:
+            if future.exception() is not None:
+                self._stats["failed"] += 1
+                return
+
+            _, started_at, duration = future.result()
+            wait = max(0.0, started_at - submitted_at)
+
+            self._stats["completed"] += 1
+            self._stats["wait_seconds_total"] += wait
+            self._stats["wait_seconds_max"] = max(
+                self._stats["wait_seconds_max"], wait)
+            self._stats["run_seconds_total"] += duration
+
+
+password_pool = PasswordPool(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
+
+
+def password_pool_busy():
+    return HTTPException(
+        status_code=503,
+        detail="Authentication service is busy, try again later",
+        headers={"Retry-After": "1"}
+    )
+
+
+def hash_password(password: str) -> str:
+    try:
+        return password_pool.run(_hash, password)
+    except PasswordPoolBusy:
+        raise password_pool_busy()
+
+
+def verify_password(plain: str, hashed: str) -> bool:
+    try:
+        return password_pool.run(_verify, plain, hashed)
+    except PasswordPoolBusy:
+        raise password_pool_busy()
+
+
+async def hash_password_async(password: str) -> str:
+    try:
+        return await password_pool.run_async(_hash, password)
+    except PasswordPoolBusy:
+        raise password_pool_busy()
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    try:
+        return await password_pool.run_async(_verify, plain, hashed)
+    except PasswordPoolBusy:
+        raise password_pool_busy()
+
+
 def create_access_token(data: dict, expires_minutes: int = ACCESS_TOKEN_EXPIRE_MINUTES):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=expires_minutes)
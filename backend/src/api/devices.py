@@ -1,16 +1,25 @@
+import os
 from datetime import datetime
-from http.client import HTTPException
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import Integer, bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.models.notifications import Notifications
 from src.models.container_sites import ContainerSite
 from src.models.containers import Containers
 from src.api.auth import get_current_user
-from src.database import get_db
+from src.database import get_async_db, SessionLocal
 from src.models.devices import Devices
 from src.schemas.devices import DeviceResponse, DeviceCreate, DeviceTelemetry
-from src.schemas.devices import DeviceTelemetryView, DeviceUpdate
+from src.schemas.devices import DeviceTelemetryView, DeviceUpdate, DeviceTelemetryResult
+from src.api.pagination import PageParams, paginate_async
+from src.schemas.pagination import Page
+from src.services.telemetry_buffer import TelemetryBuffer
+from src.services.telemetry_history import record_telemetry
+from src.services.alerts import alert_engine, FILL_LEVEL_THRESHOLD, RESOLVED
+from src.services.device_bindings import DeviceBinding, resolve_bindings, verify_bindings
+from src.services.device_bindings import invalidate_device
 
 
 router = APIRouter(
@@ -18,11 +27,30 @@ router = APIRouter(
     tags=["Devices ⚡"]
 )
 
+MAX_TELEMETRY_BATCH = int(os.getenv("MAX_TELEMETRY_BATCH", 1000))
+
+DEVICE_NOT_REGISTERED = "Device not registered"
+DEVICE_NOT_BOUND = "Device not bound to container"
+
+# режим відкладеного запису телеметрії
+TELEMETRY_BUFFERED = os.getenv("TELEMETRY_BUFFERED", "false").lower() == "true"
+TELEMETRY_BUFFER_SIZE = int(os.getenv("TELEMETRY_BUFFER_SIZE", 10000))
+TELEMETRY_FLUSH_INTERVAL = float(os.getenv("TELEMETRY_FLUSH_INTERVAL", 1.0))
+TELEMETRY_FLUSH_SIZE = int(os.getenv("TELEMETRY_FLUSH_SIZE", 500))
+
+
+async def device_site(db: AsyncSession, device: Devices):
+    return await db.scalar(
+        select(ContainerSite)
+        .join(Containers)
+        .where(Containers.container_id == device.container_id)
+    )
+
 
 @router.post("/", response_model=DeviceResponse)
-def create_device(
+async def create_device(
     data: DeviceCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current=Depends(get_current_user)
 ):
     entity, role = current
@@ -30,9 +58,9 @@ def create_device(
     if role not in ("admin", "organization"):
         raise HTTPException(403, "Access denied")
 
-    exists = db.query(Devices).filter(
-        Devices.serial_number == data.serial_number
-    ).first()
+    exists = await db.scalar(
+        select(Devices).where(Devices.serial_number == data.serial_number)
+    )
 
     if exists:
         raise HTTPException(409, "Device already exists")
@@ -47,39 +75,42 @@ def create_device(
     )
 
     db.add(device)
-    db.commit()
-    db.refresh(device)
+    await db.commit()
+    await db.refresh(device)
+
+    invalidate_device(device.serial_number)
 
     return device
 
 
-@router.get("/", response_model=list[DeviceResponse])
-def get_devices(
-    db: Session = Depends(get_db),
+@router.get("/", response_model=Page[DeviceResponse])
+async def get_devices(
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     current=Depends(get_current_user)
 ):
     entity, role = current
 
     if role == "admin":
-        return db.query(Devices).all()
+        return await paginate_async(db, select(Devices), page, Devices.device_id)
 
     if role == "organization":
-        return (
-            db.query(Devices)
+        statement = (
+            select(Devices)
             .join(Containers)
             .join(ContainerSite)
-            .filter(ContainerSite.organization_id == entity.organization_id)
-            .all()
+            .where(ContainerSite.organization_id == entity.organization_id)
         )
+        return await paginate_async(db, statement, page, Devices.device_id)
 
     raise HTTPException(403, "Access denied")
 
 
 @router.put("/{device_id}", response_model=DeviceResponse)
-def update_device(
+async def update_device(
     device_id: int,
     data: DeviceUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current=Depends(get_current_user)
 ):
     entity, role = current
@@ -87,21 +118,14 @@ def update_device(
     if role not in ("admin", "organization"):
         raise HTTPException(403, "Access denied")
 
-    device = db.query(Devices).filter(
-        Devices.device_id == device_id
-    ).first()
+    device = await db.get(Devices, device_id)
 
     if not device:
         raise HTTPException(404, "Device not found")
 
     # перевірка доступу для організації
     if role == "organization":
-        site = (
-            db.query(ContainerSite)
-            .join(Containers)
-            .filter(Containers.container_id == device.container_id)
-            .first()
-        )
+        site = await device_site(db, device)
 
         if not site or site.organization_id != entity.organization_id:
             raise HTTPException(403, "Access denied")
@@ -109,151 +133,437 @@ def update_device(
     for field, value in data.dict(exclude_unset=True).items():
         setattr(device, field, value)
 
-    db.commit()
-    db.refresh(device)
+    await db.commit()
+    await db.refresh(device)
+
+    invalidate_device(device.serial_number)
 
     return device
 
 
+def notify_alert(
+    db: Session,
+    rule: str,
+    subject_id: int,
+    level: str | None,
+    container,
+    message: str,
+    resolved_message: str
+):
+    transition = alert_engine.evaluate(db, rule, subject_id, level)
+
+    if transition is None:
+        return
+
+    db.add(Notifications(
+        message=resolved_message if transition == RESOLVED else message,
+        message_type="INFO" if transition == RESOLVED else level,
+        container_site_id=container.container_site_id,
+        container_id=container.container_id
+    ))
+
+
 def check_fill_level(fill_level: float, container, db: Session):
-    if fill_level >= 90:
-        db.add(Notifications(
-            message="Контейнер майже заповнений",
-            message_type="WARNING",
-            container_site_id=container.container_site_id,
-            container_id=container.container_id
-        ))
+    notify_alert(
+        db, "fill_level", container.container_id,
+        "WARNING" if fill_level >= FILL_LEVEL_THRESHOLD else None,
+        container,
+        "Контейнер майже заповнений",
+        "Рівень заповнення контейнера повернувся до норми"
+    )
 
 
 def check_tilt(tilted: bool, container, db: Session):
-    if tilted:
-        db.add(Notifications(
-            message="Контейнер нахилений",
-            message_type="CRITICAL",
-            container_site_id=container.container_site_id,
-            container_id=container.container_id
-        ))
+    notify_alert(
+        db, "tilt", container.container_id,
+        "CRITICAL" if tilted else None,
+        container,
+        "Контейнер нахилений",
+        "Контейнер повернуто у вертикальне положення"
+    )
 
 
 def check_temperature(temperature: float, container, db: Session):
     if temperature >= 60:
-        db.add(Notifications(
-            message=f"Критично висока температура в контейнері ({temperature} °C)",
-            message_type="CRITICAL",
-            container_site_id=container.container_site_id,
-            container_id=container.container_id
-        ))
+        level = "CRITICAL"
+        message = f"Критично висока температура в контейнері ({temperature} °C)"
     elif temperature >= 45:
-        db.add(Notifications(
-            message=f"Підвищена температура в контейнері ({temperature} °C)",
-            message_type="WARNING",
-            container_site_id=container.container_site_id,
-            container_id=container.container_id
-        ))
+        level = "WARNING"
+        message = f"Підвищена температура в контейнері ({temperature} °C)"
+    else:
+        level = None
+        message = None
+
+    notify_alert(
+        db, "temperature", container.container_id,
+        level,
+        container,
+        message,
+        f"Температура в контейнері нормалізувалась ({temperature} °C)"
+    )
 
 
-def check_battery(battery_level: int, device, db: Session):
+def check_battery(battery_level: int, device_id: int, container, db: Session):
     if battery_level <= 10:
-        db.add(Notifications(
-            message="Критично низький рівень заряду батареї пристрою",
-            message_type="CRITICAL",
-            container_site_id=device.container.container_site_id,
-            container_id=device.container.container_id
-        ))
+        level = "CRITICAL"
+        message = "Критично низький рівень заряду батареї пристрою"
     elif battery_level <= 20:
-        db.add(Notifications(
-            message="Низький рівень заряду батареї пристрою",
-            message_type="WARNING",
-            container_site_id=device.container.container_site_id,
-            container_id=device.container.container_id
-        ))
+        level = "WARNING"
+        message = "Низький рівень заряду батареї пристрою"
+    else:
+        level = None
+        message = None
+
+    notify_alert(
+        db, "battery", device_id,
+        level,
+        container,
+        message,
+        "Заряд батареї пристрою відновлено"
+    )
 
 
-def update_container_status(container: Containers):
+def container_status(fill_level: int, tilted: bool, temperature: float) -> str:
     statuses = []
-    if container.fill_level == 0:
+    if fill_level == 0:
         statuses.append("порожній")
-    if container.fill_level >= 90:
+    if fill_level >= FILL_LEVEL_THRESHOLD:
         statuses.append("переповнений")
-    if container.tilted:
+    if tilted:
         statuses.append("нахилений")
-    if container.temperature >= 60:
+    if temperature >= 60:
         statuses.append("ризик пожежі")
     if not statuses:
         statuses.append("активний")
-    container.status = ",".join(statuses)
+    return ",".join(statuses)
+
+
+def update_container_status(container: Containers):
+    container.status = container_status(
+        container.fill_level,
+        container.tilted,
+        container.temperature
+    )
+
+
+# оновлення за первинним ключем без попереднього читання рядків
+DEVICE_TELEMETRY_UPDATE = (
+    update(Devices.__table__)
+    .where(Devices.device_id == bindparam("b_device_id"))
+    .values(
+        last_signal=bindparam("b_last_signal"),
+        status="active",
+        battery_level=func.coalesce(
+            bindparam("b_battery_level", type_=Integer),
+            Devices.battery_level
+        )
+    )
+)
+
+CONTAINER_TELEMETRY_UPDATE = (
+    update(Containers.__table__)
+    .where(Containers.container_id == bindparam("b_container_id"))
+    .values(
+        fill_level=bindparam("b_fill_level"),
+        temperature=bindparam("b_temperature"),
+        tilted=bindparam("b_tilted"),
+        status=bindparam("b_status"),
+        last_update=bindparam("b_last_update")
+    )
+)
+
+
+def battery_reading(data: DeviceTelemetry) -> int | None:
+    # пристрій може не передавати заряд батареї
+    if data.battery_level is None:
+        return None
+    return max(0, min(data.battery_level, 100))
+
+
+CONTAINER_ALERT_RULES = ("fill_level", "tilt", "temperature")
+
+
+# Рядки контейнерів (а пристроїв — у verify_bindings) блокуються до кінця
+# транзакції, щоб воркери оцінювали переходи одного об'єкта по черзі
+def lock_alert_subjects(db: Session, device_ids, container_ids):
+    db.execute(
+        select(Containers.container_id)
+        .where(Containers.container_id.in_(sorted(container_ids)))
+        .order_by(Containers.container_id)
+        .with_for_update()
+    )
+
+    alert_engine.load(db, [
+        *(("battery", device_id) for device_id in device_ids),
+        *(
+            (rule, container_id)
+            for container_id in container_ids
+            for rule in CONTAINER_ALERT_RULES
+        ),
+    ])
+
+
+def binding_error(binding: DeviceBinding | None) -> str | None:
+    if not binding:
+        return DEVICE_NOT_REGISTERED
+    if not binding.container_id:
+        return DEVICE_NOT_BOUND
+    return None
+
+
+# Повертає показання, відхилені через застарілу прив'язку в кеші:
+# serial_number -> причина. Решта пакета записується.
+def store_telemetry(
+    items: list[tuple[DeviceTelemetry, DeviceBinding]],
+    db: Session
+) -> dict[str, str]:
+    if not items:
+        return {}
+
+    current = verify_bindings(
+        db,
+        {data.serial_number: binding for data, binding in items}
+    )
+
+    rejected = {}
+    verified = []
+    for data, _ in items:
+        binding = current.get(data.serial_number)
+        error = binding_error(binding)
+
+        if error:
+            rejected[data.serial_number] = error
+        else:
+            verified.append((data, binding))
+
+    items = verified
+    if not items:
+        return rejected
+
+    now = datetime.utcnow()
+
+    # шлюз може надіслати кілька показань одного контейнера в пакеті; усі вони
+    # отримують однаковий час, тож і стан контейнера, і історія беруть останнє
+    latest_devices = {binding.device_id: (data, binding) for data, binding in items}
+    latest_containers = {
+        binding.container_id: (data, binding) for data, binding in items
+    }
+
+    lock_alert_subjects(db, latest_devices, latest_containers)
+
+    devices = []
+    containers = []
+    history = []
+
+    for data, binding in latest_devices.values():
+        battery_level = battery_reading(data)
+
+        devices.append({
+            "b_device_id": binding.device_id,
+            "b_last_signal": now,
+            "b_battery_level": battery_level
+        })
+
+        if battery_level is not None:
+            check_battery(battery_level, binding.device_id, binding, db)
+
+    for data, binding in latest_containers.values():
+        fill_level = int(max(0, min(data.fill_level, 100)))
+        temperature = max(-40, min(data.temperature, 120))
+
+        containers.append({
+            "b_container_id": binding.container_id,
+            "b_fill_level": fill_level,
+            "b_temperature": temperature,
+            "b_tilted": data.tilted,
+            "b_status": container_status(fill_level, data.tilted, temperature),
+            "b_last_update": now
+        })
+        history.append({
+            "container_id": binding.container_id,
+            "recorded_at": now,
+            "fill_level": fill_level,
+            "temperature": temperature,
+            "tilted": data.tilted,
+            "battery_level": battery_reading(data)
+        })
+
+        check_fill_level(fill_level, binding, db)
+        check_tilt(data.tilted, binding, db)
+        check_temperature(temperature, binding, db)
+
+    db.execute(DEVICE_TELEMETRY_UPDATE, devices)
+    db.execute(CONTAINER_TELEMETRY_UPDATE, containers)
+    record_telemetry(db, history)
+
+    return rejected
+
+
+def process_telemetry_batch(readings: list[DeviceTelemetry], db: Session):
+    bindings = resolve_bindings(
+        db,
+        [reading.serial_number for reading in readings]
+    )
+
+    results = []
+    accepted = []
+
+    for reading in readings:
+        binding = bindings.get(reading.serial_number)
+        error = binding_error(binding)
+
+        if error:
+            results.append({
+                "serial_number": reading.serial_number,
+                "status": "error",
+                "detail": error
+            })
+            continue
+
+        accepted.append((reading, binding))
+        results.append({
+            "serial_number": reading.serial_number,
+            "status": "ok"
+        })
+
+    rejected = store_telemetry(accepted, db)
+
+    for result in results:
+        if result["serial_number"] in rejected and result["status"] == "ok":
+            result["status"] = "error"
+            result["detail"] = rejected[result["serial_number"]]
+
+    db.commit()
+    return results
+
+
+def flush_telemetry(readings: list[DeviceTelemetry]):
+    db = SessionLocal()
+    try:
+        process_telemetry_batch(readings, db)
+    finally:
+        db.close()
+
+
+telemetry_buffer = TelemetryBuffer(
+    flush=flush_telemetry,
+    max_size=TELEMETRY_BUFFER_SIZE,
+    flush_interval=TELEMETRY_FLUSH_INTERVAL,
+    flush_size=TELEMETRY_FLUSH_SIZE
+)
+
+
+def buffer_full():
+    return HTTPException(
+        503,
+        "Telemetry buffer is full",
+        headers={"Retry-After": str(max(1, int(TELEMETRY_FLUSH_INTERVAL)))}
+    )
 
 
 @router.post("/telemetry")
-def receive_telemetry(
+async def receive_telemetry(
     data: DeviceTelemetry,
-    db: Session = Depends(get_db)
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    device = db.query(Devices).filter(
-        Devices.serial_number == data.serial_number
-    ).first()
+    if TELEMETRY_BUFFERED:
+        if not telemetry_buffer.put(data):
+            raise buffer_full()
 
-    if not device:
-        raise HTTPException(404, "Device not registered")
+        response.status_code = 202
+        return {"status": "queued"}
 
-    if not device.container_id:
-        raise HTTPException(409, "Device not bound to container")
+    bindings = await db.run_sync(resolve_bindings, [data.serial_number])
+    binding = bindings.get(data.serial_number)
 
-    container = db.query(Containers).filter(
-        Containers.container_id == device.container_id
-    ).first()
+    if not binding:
+        raise HTTPException(404, DEVICE_NOT_REGISTERED)
 
-    fill_level = max(0, min(data.fill_level, 100))
-    temperature = max(-40, min(data.temperature, 120))
-    battery_level = max(0, min(data.battery_level, 100))
+    if not binding.container_id:
+        raise HTTPException(409, DEVICE_NOT_BOUND)
 
-    device.last_signal = datetime.utcnow()
-    device.battery_level = battery_level
-    device.status = "active"
+    rejected = await db.run_sync(
+        lambda session: store_telemetry([(data, binding)], session)
+    )
 
-    container.fill_level = fill_level
-    container.temperature = temperature
-    container.tilted = data.tilted
-    container.last_update = datetime.utcnow()
+    if data.serial_number in rejected:
+        raise HTTPException(
+            404 if rejected[data.serial_number] == DEVICE_NOT_REGISTERED else 409,
+            rejected[data.serial_number]
+        )
 
-    update_container_status(container)
+    await db.commit()
+    return {"status": "ok"}
 
-    check_fill_level(fill_level, container, db)
-    check_tilt(data.tilted, container, db)
-    check_temperature(temperature, container, db)
-    check_battery(battery_level, device, db)
 
-    db.commit()
-    return {"status": "ok"}
+@router.post(
+    "/telemetry/batch",
+    response_model=list[DeviceTelemetryResult],
+    summary="Receive a batch of telemetry readings"
+)
+async def receive_telemetry_batch(
+    data: list[DeviceTelemetry],
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    if len(data) > MAX_TELEMETRY_BATCH:
+        raise HTTPException(
+            413,
+            f"Batch is limited to {MAX_TELEMETRY_BATCH} readings"
+        )
+
+    if not data:
+        return []
+
+    if not TELEMETRY_BUFFERED:
+        return await db.run_sync(
+            lambda session: process_telemetry_batch(data, session)
+        )
+
+    results = []
+
+    for reading in data:
+        if telemetry_buffer.put(reading):
+            results.append({
+                "serial_number": reading.serial_number,
+                "status": "queued"
+            })
+        else:
+            results.append({
+                "serial_number": reading.serial_number,
+                "status": "error",
+                "detail": "Telemetry buffer is full"
+            })
+
+    if all(result["status"] == "error" for result in results):
+        raise buffer_full()
+
+    response.status_code = 202
+    return results
 
 
 @router.get(
     "/{device_id}/telemetry",
     response_model=DeviceTelemetryView
 )
-def get_device_telemetry(
+async def get_device_telemetry(
     device_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current=Depends(get_current_user)
 ):
     entity, role = current
 
-    device = db.query(Devices).filter(
-        Devices.device_id == device_id
-    ).first()
+    device = await db.get(Devices, device_id)
 
     if not device:
         raise HTTPException(404, "Device not found")
 
-    container = db.query(Containers).filter(
-        Containers.container_id == device.container_id
-    ).first()
+    container = await db.get(Containers, device.container_id)
 
     # перевірка доступу
     if role == "organization":
-        site = db.query(ContainerSite).filter(
-            ContainerSite.container_site_id == container.container_site_id
-        ).first()
+        site = await db.get(ContainerSite, container.container_site_id)
 
         if site.organization_id != entity.organization_id:
             raise HTTPException(403, "Access denied")
@@ -274,9 +584,9 @@ def get_device_telemetry(
 
 
 @router.delete("/{device_id}", status_code=204)
-def delete_device(
+async def delete_device(
     device_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current=Depends(get_current_user)
 ):
     entity, role = current
@@ -284,25 +594,22 @@ def delete_device(
     if role not in ("admin", "organization"):
         raise HTTPException(403, "Access denied")
 
-    device = db.query(Devices).filter(
-        Devices.device_id == device_id
-    ).first()
+    device = await db.get(Devices, device_id)
 
     if not device:
         raise HTTPException(404, "Device not found")
 
     if role == "organization":
-        site = (
-            db.query(ContainerSite)
-            .join(Containers)
-            .filter(Containers.container_id == device.container_id)
-            .first()
-        )
+        site = await device_site(db, device)
 
         if not site or site.organization_id != entity.organization_id:
             raise HTTPException(403, "Access denied")
 
-    db.delete(device)
-    db.commit()
+    serial_number = device.serial_number
+
+    await db.delete(device)
+    await db.commit()
+
+    invalidate_device(serial_number)
 
     return
@@ -4,6 +4,8 @@ from sqlalchemy.orm import Session
 
 from src.database import get_db
 from src.api.auth import get_current_user
+from src.api.pagination import PageParams, paginate
+from src.schemas.pagination import Page
 from src.models.client_companies import ClientCompanies
 from src.models.disposal_requests import DisposalRequests
 from src.models.organization import Organization
@@ -13,6 +15,11 @@ from src.schemas.client_companies import (
     DisposalStatisticsResponse,
 )
 from src.api.core import hash_password
+from src.services.client_stats import (
+    request_created,
+    request_deleted,
+    request_status_changed,
+)
 from datetime import date, datetime
 
 router = APIRouter(
@@ -57,33 +64,38 @@ def create_disposal_request(
     )
 
     db.add(new_request)
+    db.flush()
+    request_created(db, new_request)
     db.commit()
     db.refresh(new_request)
 
     return new_request
 
 
-@router.get("/", response_model=list[DisposalRequestResponse])
+@router.get("/", response_model=Page[DisposalRequestResponse])
 def get_my_disposal_requests(
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current=Depends(get_current_user)
 ):
     entity, role = current
 
+    query = db.query(DisposalRequests)
+
     if role == "client_company":
-        return db.query(DisposalRequests).filter(
+        query = query.filter(
             DisposalRequests.client_id == entity.client_id
-        ).all()
+        )
 
-    if role == "organization":
-        return db.query(DisposalRequests).filter(
+    elif role == "organization":
+        query = query.filter(
             DisposalRequests.organization_id == entity.organization_id
-        ).all()
+        )
 
-    if role == "admin":
-        return db.query(DisposalRequests).all()
+    elif role != "admin":
+        raise HTTPException(403, "Access denied")
 
-    raise HTTPException(403, "Access denied")
+    return paginate(query, page, DisposalRequests.request_id)
 
 
 @router.put("/{request_id}/status", response_model=DisposalRequestResponse)
@@ -105,9 +117,11 @@ def update_disposal_request_status(
     if not request:
         raise HTTPException(404, "Request not found")
 
+    old_status = request.status
     request.status = status
     request.updated_at = datetime.utcnow()
 
+    request_status_changed(db, request, old_status)
     db.commit()
     db.refresh(request)
 
@@ -133,6 +147,7 @@ def delete_disposal_request(
         )
 
     if role == "admin":
+        request_deleted(db, request)
         db.delete(request)
         db.commit()
         return
@@ -147,6 +162,7 @@ def delete_disposal_request(
                 detail="Only pending requests can be deleted"
             )
 
+        request_deleted(db, request)
         db.delete(request)
         db.commit()
         return
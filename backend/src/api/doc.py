@@ -1,47 +1,72 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import Date, cast
-from sqlalchemy.orm import Session
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 
 from src.models.disposal_requests import DisposalRequests
-from src.models.container_sites import ContainerSite
-from src.models.pickups import Pickups
-from src.models.vehicles import Vehicles
 from src.schemas.doc import WasteTransferActDTO
-from src.database import get_db
+from src.services.replicas import read_session_factory
 from src.models import ClientCompanies, Organization
 from src.api.auth import get_current_user
-from datetime import date, datetime
+from src.services.pdf import pdf_renderer
+from datetime import date, timedelta
 
 router = APIRouter(
     prefix="/documents",
     tags=["Documents 📄"]
 )
 
+ACTS_CHUNK_SIZE = int(os.getenv("ACTS_CHUNK_SIZE", 1000))
 
-@router.get(
-    "/waste-transfer-acts",
-    response_model=list[WasteTransferActDTO],
-    summary="View all waste transfer acts (generated dynamically)"
+transfer_time = func.coalesce(
+    DisposalRequests.updated_at,
+    DisposalRequests.created_at
 )
-def get_all_waste_transfer_acts(
-    db: Session = Depends(get_db),
-    current=Depends(get_current_user)
-):
-    current_user, role = current
 
-    query = db.query(DisposalRequests)
+
+def waste_transfer_acts_query(
+    current_user,
+    role: str,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    after: int | None = None,
+    limit: int | None = None
+):
+    # один запит із join-ами замість ліниво завантажених client/organization
+    query = (
+        select(
+            DisposalRequests.request_id,
+            DisposalRequests.waste_description,
+            transfer_time.label("transfer_time"),
+            ClientCompanies.name.label("client_name"),
+            ClientCompanies.edrpou.label("client_edrpou"),
+            ClientCompanies.city.label("client_city"),
+            ClientCompanies.street.label("client_street"),
+            ClientCompanies.building.label("client_building"),
+            ClientCompanies.phone_number.label("client_phone"),
+            Organization.name.label("org_name"),
+            Organization.edrpou.label("org_edrpou"),
+            Organization.city.label("org_city"),
+            Organization.street.label("org_street"),
+            Organization.building.label("org_building"),
+            Organization.phone_number.label("org_phone"),
+        )
+        .join(ClientCompanies, DisposalRequests.client_id == ClientCompanies.client_id)
+        .join(Organization, DisposalRequests.organization_id == Organization.organization_id)
+    )
 
     if role == "admin":
         pass
 
     elif role == "organization":
-        query = query.filter(
+        query = query.where(
             DisposalRequests.organization_id ==
             current_user.organization_id
         )
 
     elif role == "client_company":
-        query = query.filter(
+        query = query.where(
             DisposalRequests.client_id ==
             current_user.client_id
         )
@@ -49,42 +74,142 @@ def get_all_waste_transfer_acts(
     else:
         raise HTTPException(403, "Access denied")
 
-    requests = query.all()
+    if date_from:
+        query = query.where(transfer_time >= date_from)
 
-    acts: list[WasteTransferActDTO] = []
+    if date_to:
+        query = query.where(transfer_time < date_to + timedelta(days=1))
 
-    for r in requests:
-        if not r.client or not r.organization:
-            continue
+    if after is not None:
+        query = query.where(DisposalRequests.request_id > after)
 
-        client = r.client
-        organization = r.organization
+    query = query.order_by(DisposalRequests.request_id)
 
-        sender_address = (
-            f"{client.city}, {client.street}, {client.building}"
-        )
-        receiver_address = (
-            f"{organization.city}, {organization.street}, {organization.building}"
+    if limit is not None:
+        query = query.limit(limit)
+
+    return query
+
+
+def build_act(row) -> WasteTransferActDTO:
+    return WasteTransferActDTO(
+        request_id=row.request_id,
+        city=row.org_city,
+        act_date=row.transfer_time.date(),
+
+        sender_name=row.client_name,
+        sender_edrpou=row.client_edrpou,
+        sender_address=(
+            f"{row.client_city}, {row.client_street}, {row.client_building}"
+        ),
+        sender_phone=row.client_phone,
+
+        receiver_name=row.org_name,
+        receiver_edrpou=row.org_edrpou,
+        receiver_address=(
+            f"{row.org_city}, {row.org_street}, {row.org_building}"
+        ),
+        receiver_phone=row.org_phone,
+
+        transfer_datetime=row.transfer_time,
+        waste_description=row.waste_description,
+    )
+
+
+def stream_acts(query, session_factory):
+    db = session_factory()
+
+    try:
+        result = db.execute(
+            query.execution_options(yield_per=ACTS_CHUNK_SIZE)
         )
 
-        transfer_time = r.updated_at or r.created_at
+        yield "["
+        separator = ""
+
+        for rows in result.partitions():
+            chunk = []
+
+            for row in rows:
+                chunk.append(separator + build_act(row).model_dump_json())
+                separator = ","
 
-        acts.append(WasteTransferActDTO(
-            city=organization.city,
-            act_date=transfer_time.date(),
+            yield "".join(chunk)
 
-            sender_name=client.name,
-            sender_edrpou=client.edrpou,
-            sender_address=sender_address,
-            sender_phone=client.phone_number,
+        yield "]"
+    finally:
+        db.close()
 
-            receiver_name=organization.name,
-            receiver_edrpou=organization.edrpou,
-            receiver_address=receiver_address,
-            receiver_phone=organization.phone_number,
 
-            transfer_datetime=transfer_time,
-            waste_description=r.waste_description,
-        ))
+@router.get(
+    "/waste-transfer-acts",
+    response_model=list[WasteTransferActDTO],
+    response_class=StreamingResponse,
+    summary="View all waste transfer acts (generated dynamically)"
+)
+def get_all_waste_transfer_acts(
+    date_from: date | None = None,
+    date_to: date | None = None,
+    after: int | None = Query(
+        None, description="request_id of the last act from the previous page"),
+    limit: int | None = Query(None, ge=1),
+    session_factory=Depends(read_session_factory),
+    current=Depends(get_current_user)
+):
+    current_user, role = current
+
+    query = waste_transfer_acts_query(
+        current_user, role, date_from, date_to, after, limit
+    )
+
+    return StreamingResponse(
+        stream_acts(query, session_factory),
+        media_type="application/json"
+    )
+
+
+def stream_acts_zip(query, session_factory):
+    db = session_factory()
+
+    try:
+        result = db.execute(
+            query.execution_options(yield_per=ACTS_CHUNK_SIZE)
+        )
+        acts = (build_act(row).model_dump(mode="json") for row in result)
+
+        yield from pdf_renderer.zip_stream(
+            acts,
+            lambda act: f"act_{act['request_id']}.pdf"
+        )
+    finally:
+        db.close()
+
+
+@router.get(
+    "/waste-transfer-acts/pdf",
+    response_class=StreamingResponse,
+    summary="Download waste transfer acts as a ZIP of PDF files"
+)
+def get_waste_transfer_acts_pdf(
+    date_from: date | None = None,
+    date_to: date | None = None,
+    after: int | None = Query(
+        None, description="request_id of the last act from the previous page"),
+    limit: int | None = Query(None, ge=1),
+    session_factory=Depends(read_session_factory),
+    current=Depends(get_current_user)
+):
+    current_user, role = current
 
-    return acts
+    query = waste_transfer_acts_query(
+        current_user, role, date_from, date_to, after, limit
+    )
+
+    return StreamingResponse(
+        stream_acts_zip(query, session_factory),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition":
+            'attachment; filename="waste-transfer-acts.zip"'
+        }
+    )
@@ -0,0 +1,164 @@
+import csv
+import io
+import json
+import os
+from datetime import date, datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from src.api.auth import get_current_user
+from src.database import SessionLocal
+from src.models.container_sites import ContainerSite
+from src.models.containers import Containers
+from src.models.disposal_requests import DisposalRequests
+from src.models.notifications import Notifications
+from src.models.pickups import Pickups
+
+router = APIRouter(
+    prefix="/exports",
+    tags=["Exports 📦"]
+)
+
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 1000))
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def containers_export(entity, role):
+    statement = select(Containers.__table__)
+
+    if role == "organization":
+        return statement.join(ContainerSite).where(
+            ContainerSite.organization_id == entity.organization_id
+        )
+
+    if role != "admin":
+        raise HTTPException(403, "Access denied")
+
+    return statement
+
+
+def pickups_export(entity, role):
+    statement = select(Pickups.__table__)
+
+    if role == "organization":
+        return statement.join(ContainerSite).where(
+            ContainerSite.organization_id == entity.organization_id
+        )
+
+    if role != "admin":
+        raise HTTPException(403, "Access denied")
+
+    return statement
+
+
+def disposal_requests_export(entity, role):
+    statement = select(DisposalRequests.__table__)
+
+    if role == "client_company":
+        return statement.where(DisposalRequests.client_id == entity.client_id)
+
+    if role == "organization":
+        return statement.where(
+            DisposalRequests.organization_id == entity.organization_id
+        )
+
+    if role != "admin":
+        raise HTTPException(403, "Access denied")
+
+    return statement
+
+
+def notifications_export(entity, role):
+    statement = select(Notifications.__table__)
+
+    if role == "organization":
+        return statement.join(
+            ContainerSite,
+            Notifications.container_site_id == ContainerSite.container_site_id
+        ).where(ContainerSite.organization_id == entity.organization_id)
+
+    if role != "admin":
+        raise HTTPException(403, "Access denied")
+
+    return statement
+
+
+EXPORTS = {
+    "containers": (containers_export, Containers.container_id),
+    "pickups": (pickups_export, Pickups.pickup_id),
+    "disposal-requests": (disposal_requests_export, DisposalRequests.request_id),
+    "notifications": (notifications_export, Notifications.notification_id),
+}
+
+
+def json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+# Рядки читаються серверним курсором порціями та одразу віддаються клієнту,
+# тому пам'ять не залежить від розміру таблиці
+def stream_rows(statement, export_format: str):
+    db = SessionLocal()
+
+    try:
+        result = db.execute(
+            statement.execution_options(yield_per=EXPORT_CHUNK_SIZE)
+        )
+        columns = list(result.keys())
+
+        if export_format == "csv":
+            buffer = io.StringIO()
+            csv.writer(buffer).writerow(columns)
+            yield buffer.getvalue()
+
+        for rows in result.partitions():
+            buffer = io.StringIO()
+
+            if export_format == "csv":
+                csv.writer(buffer).writerows(rows)
+            else:
+                for row in rows:
+                    buffer.write(json.dumps(
+                        dict(zip(columns, row)),
+                        default=json_default,
+                        ensure_ascii=False
+                    ))
+                    buffer.write("\n")
+
+            yield buffer.getvalue()
+    finally:
+        db.close()
+
+
+@router.get(
+    "/{collection}",
+    summary="Stream a collection as NDJSON or CSV",
+    response_class=StreamingResponse
+)
+def export_collection(
+    collection: Literal["containers", "pickups", "disposal-requests", "notifications"],
+    format: Literal["ndjson", "csv"] = "ndjson",
+    current=Depends(get_current_user)
+):
+    entity, role = current
+
+    build, order_column = EXPORTS[collection]
+    statement = build(entity, role).order_by(order_column)
+
+    return StreamingResponse(
+        stream_rows(statement, format),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition":
+            f'attachment; filename="{collection}.{format}"'
+        }
+    )
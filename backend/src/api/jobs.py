@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from src.api.auth import get_current_user
+from src.schemas.jobs import JobResponse
+from src.services.jobs import job_registry
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["Jobs ⏳"]
+)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobResponse,
+    summary="Background job progress"
+)
+def get_job(
+    job_id: str,
+    current=Depends(get_current_user)
+):
+    _, role = current
+
+    # усі разові завдання запускає адміністратор
+    if role != "admin":
+        raise HTTPException(403, "Access denied")
+
+    job = job_registry.get(job_id)
+
+    if not job:
+        raise HTTPException(404, "Job not found")
+
+    return job
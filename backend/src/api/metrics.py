@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from src.api.auth import get_current_user
+from src.api.core import password_pool
+from src.database import async_engine, async_pool_stats, engine, pool_stats
+from src.services.replicas import replicas
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics 📈"]
+)
+
+
+def only_admin_metrics(current=Depends(get_current_user)):
+    _, role = current
+
+    if role != "admin":
+        raise HTTPException(403, "Only admin can view metrics")
+
+
+@router.get(
+    "/password-hashing",
+    summary="Password hashing pool queue metrics",
+    dependencies=[Depends(only_admin_metrics)]
+)
+def password_hashing_metrics():
+    return password_pool.stats()
+
+
+@router.get(
+    "/db-pool",
+    summary="Database connection pool metrics",
+    dependencies=[Depends(only_admin_metrics)]
+)
+def db_pool_metrics():
+    return {
+        "sync": pool_stats.snapshot(engine.pool),
+        "async": async_pool_stats.snapshot(async_engine.sync_engine.pool),
+        "replicas": replicas.stats(),
+    }
@@ -6,8 +6,11 @@ from src.models.notifications import Notifications
 from src.models.notifications import Notifications
 from src.schemas.containers import NotificationResponse
 from src.api.auth import get_current_user
+from src.api.pagination import PageParams, paginate
+from src.schemas.pagination import Page
 from src.database import get_db
 from src.api.core import hash_password
+from src.services.identity_cache import identity_cache
 from src.models.organization import Organization
 from src.schemas.organizations import OrganizationCreate, OrganizationResponse, OrganizationUpdate
 from src.models.disposal_requests import DisposalRequests
@@ -18,9 +21,12 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=list[OrganizationResponse])
-def get_organizations(db: Session = Depends(get_db)):
-    return db.query(Organization).all()
+@router.get("/", response_model=Page[OrganizationResponse])
+def get_organizations(
+    page: PageParams = Depends(),
+    db: Session = Depends(get_db)
+):
+    return paginate(db.query(Organization), page, Organization.organization_id)
 
 
 @router.get("/{organization_id}", response_model=OrganizationResponse)
@@ -79,29 +85,27 @@ def update_organization(
     db.commit()
     db.refresh(org)
 
+    identity_cache.invalidate("organization", organization_id)
+
     return org
 
 
 @router.get(
     "/{organization_id}/notifications",
-    response_model=list[NotificationResponse]
+    response_model=Page[NotificationResponse]
 )
 def get_notifications_for_org(
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current=Depends(get_current_user)
 ):
     entity, role = current
 
-    if role == "admin":
-        return (
-            db.query(Notifications)
-            .order_by(Notifications.created_at.desc())
-            .all()
-        )
+    query = db.query(Notifications)
 
     if role == "organization":
-        return (
-            db.query(Notifications)
+        query = (
+            query
             .join(
                 ContainerSite,
                 Notifications.container_site_id ==
@@ -111,8 +115,15 @@ def get_notifications_for_org(
                 ContainerSite.organization_id ==
                 entity.organization_id
             )
-            .order_by(Notifications.created_at.desc())
-            .all()
         )
 
-    raise HTTPException(403, "Access denied")
+    elif role != "admin":
+        raise HTTPException(403, "Access denied")
+
+    return paginate(
+        query,
+        page,
+        Notifications.created_at,
+        Notifications.notification_id,
+        descending=True
+    )
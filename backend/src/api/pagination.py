@@ -0,0 +1,125 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, Query
+from sqlalchemy import DateTime, func, literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# значення, яким у ключі пагінації замінюється NULL у колонці дати
+NULL_DATETIME = datetime.min
+
+
+class PageParams:
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        after: str | None = Query(
+            None, description="next_cursor from the previous page")
+    ):
+        self.limit = limit
+        self.after = after
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps([
+        value.isoformat() if isinstance(value, datetime) else value
+        for value in values
+    ])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str, columns) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if len(values) != len(columns):
+            raise ValueError
+
+        return [
+            datetime.fromisoformat(value)
+            if isinstance(column.type, DateTime) else value
+            for value, column in zip(values, columns)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(400, "Invalid cursor")
+
+
+# NULL у порівнянні кортежів дає NULL, і сторінки обривалися б на першому
+# такому рядку, тому nullable колонки дат порівнюються через coalesce
+def _key(column):
+    if not column.nullable:
+        return column
+
+    if isinstance(column.type, DateTime):
+        return func.coalesce(column, literal(NULL_DATETIME, DateTime))
+
+    raise TypeError(f"Keyset column {column.key} must be NOT NULL")
+
+
+def _cursor_value(row, column):
+    value = getattr(row, column.key)
+    if value is None and column.nullable:
+        return NULL_DATETIME
+    return value
+
+
+def _after_cursor(page: PageParams, columns, descending: bool):
+    values = decode_cursor(page.after, columns)
+    key = tuple_(*map(_key, columns))
+    return key < tuple_(*values) if descending else key > tuple_(*values)
+
+
+def _order(columns, descending: bool):
+    keys = map(_key, columns)
+    return [key.desc() if descending else key.asc() for key in keys]
+
+
+def _page(rows, page: PageParams, columns) -> dict:
+    next_cursor = None
+
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        next_cursor = encode_cursor(
+            [_cursor_value(rows[-1], column) for column in columns]
+        )
+
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+# Пагінація за ключем: наступна сторінка починається одразу після
+# останнього рядка попередньої, тож вартість не залежить від глибини
+def paginate(query, page: PageParams, *columns, descending: bool = False):
+    if page.after:
+        query = query.filter(_after_cursor(page, columns, descending))
+
+    rows = (
+        query
+        .order_by(*_order(columns, descending))
+        .limit(page.limit + 1)
+        .all()
+    )
+
+    return _page(rows, page, columns)
+
+
+# Те саме для select() в AsyncSession
+async def paginate_async(
+    db: AsyncSession,
+    statement,
+    page: PageParams,
+    *columns,
+    descending: bool = False
+):
+    if page.after:
+        statement = statement.where(_after_cursor(page, columns, descending))
+
+    rows = (await db.execute(
+        statement
+        .order_by(*_order(columns, descending))
+        .limit(page.limit + 1)
+    )).scalars().all()
+
+    return _page(rows, page, columns)
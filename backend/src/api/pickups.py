@@ -1,17 +1,23 @@
 from fastapi import APIRouter
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Query
 from sqlalchemy import func
-from datetime import date
+from datetime import date, datetime, time, timedelta
+from itertools import groupby
 from sqlalchemy.orm import Session
 
 from src.models.containers import Containers
-from src.models.users import Users
-from src.models.notifications import Notifications
 from src.database import get_db
 from src.models.container_sites import ContainerSite
 from src.models.pickups import Pickups
 from src.schemas.pickups import PickupCreate, PickupResponse, PickupStatisticsResponse, PickupUpdate
+from src.schemas.pickups import AutoScheduleResponse, DayRoutes, RouteStop, VehicleRoute
+from src.schemas.pickups import UnassignedPickup
 from src.api.auth import get_current_user
+from src.api.pagination import PageParams, paginate
+from src.schemas.pagination import Page
+from src.services.notifications import broadcast_city_notification
+from src.services.routing import plan_route
+from src.services.pickup_scheduler import schedule_organization, try_scheduler_lock
 
 
 router = APIRouter(
@@ -47,38 +53,28 @@ def create_pickup(
     )
 
     db.add(pickup)
-    db.commit()
-    db.refresh(pickup)
-
-    users_in_city = (
-        db.query(Users)
-        .filter(Users.city == containersite.city)
-        .all()
-    )
 
-    notifications = []
-
-    for user in users_in_city:
-        notifications.append(
-            Notifications(
-                user_id=user.user_id,
-                container_site_id=containersite.container_site_id,
-                message_type="waste_collection",
-                message=(
-                    f"Заплановано вивіз сміття за адресою "
-                    f"{containersite.street} {containersite.building}"
-                )
+    if containersite.city:
+        broadcast_city_notification(
+            db,
+            containersite.city,
+            containersite.container_site_id,
+            "waste_collection",
+            (
+                f"Заплановано вивіз сміття за адресою "
+                f"{containersite.street} {containersite.building}"
             )
         )
 
-    db.add_all(notifications)
     db.commit()
+    db.refresh(pickup)
 
     return pickup
 
 
-@router.get("/", response_model=list[PickupResponse])
+@router.get("/", response_model=Page[PickupResponse])
 def get_pickups(
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current=Depends(get_current_user)
 ):
@@ -93,7 +89,131 @@ def get_pickups(
     elif role != "admin":
         raise HTTPException(403, "Access denied")
 
-    return query.all()
+    return paginate(query, page, Pickups.pickup_id)
+
+
+def vehicle_route(vehicle_id: int, pickups: list) -> VehicleRoute:
+    # маршрут починається з найранішого запланованого вивозу
+    order, dist = plan_route(
+        [pickup.location_lat for pickup in pickups],
+        [pickup.location_lng for pickup in pickups]
+    )
+
+    stops = []
+    total = 0.0
+    previous = None
+
+    for index in order:
+        pickup = pickups[index]
+        distance = 0.0 if previous is None else float(dist[previous, index])
+        total += distance
+        previous = index
+
+        stops.append(RouteStop(
+            pickup_id=pickup.pickup_id,
+            container_site_id=pickup.container_site_id,
+            location_lat=pickup.location_lat,
+            location_lng=pickup.location_lng,
+            scheduled_time=pickup.scheduled_time,
+            distance_km=round(distance, 3)
+        ))
+
+    return VehicleRoute(
+        vehicle_id=vehicle_id,
+        total_distance_km=round(total, 3),
+        stops=stops
+    )
+
+
+@router.get("/routes", response_model=DayRoutes)
+def get_pickup_routes(
+    day: date = Query(..., alias="date"),
+    db: Session = Depends(get_db),
+    current=Depends(get_current_user)
+):
+    entity, role = current
+
+    start = datetime.combine(day, time.min)
+
+    query = (
+        db.query(
+            Pickups.pickup_id,
+            Pickups.vehicle_id,
+            Pickups.container_site_id,
+            Pickups.scheduled_time,
+            ContainerSite.location_lat,
+            ContainerSite.location_lng
+        )
+        .join(ContainerSite)
+        .filter(
+            Pickups.scheduled_time >= start,
+            Pickups.scheduled_time < start + timedelta(days=1),
+            Pickups.completed_time.is_(None)
+        )
+    )
+
+    if role == "organization":
+        query = query.filter(
+            ContainerSite.organization_id == entity.organization_id
+        )
+    elif role != "admin":
+        raise HTTPException(403, "Access denied")
+
+    pickups = query.order_by(
+        Pickups.vehicle_id.nulls_last(),
+        Pickups.scheduled_time,
+        Pickups.pickup_id
+    ).all()
+
+    # вивози без машини не об'єднуються в маршрут, їх ще треба розподілити
+    return DayRoutes(
+        routes=[
+            vehicle_route(vehicle_id, list(group))
+            for vehicle_id, group in groupby(pickups, key=lambda p: p.vehicle_id)
+            if vehicle_id is not None
+        ],
+        unassigned=[
+            UnassignedPickup(
+                pickup_id=pickup.pickup_id,
+                container_site_id=pickup.container_site_id,
+                location_lat=pickup.location_lat,
+                location_lng=pickup.location_lng,
+                scheduled_time=pickup.scheduled_time
+            )
+            for pickup in pickups
+            if pickup.vehicle_id is None
+        ]
+    )
+
+
+@router.post("/auto-schedule", response_model=AutoScheduleResponse)
+def auto_schedule_pickups(
+    dry_run: bool = False,
+    organization_id: int | None = None,
+    db: Session = Depends(get_db),
+    current=Depends(get_current_user)
+):
+    entity, role = current
+
+    if role == "organization":
+        organization_id = entity.organization_id
+    elif role != "admin":
+        raise HTTPException(403, "Access denied")
+    elif organization_id is None:
+        raise HTTPException(
+            status_code=400,
+            detail="organization_id is required for admin"
+        )
+
+    if not try_scheduler_lock(db):
+        raise HTTPException(409, "Pickup scheduling is already running")
+
+    result = schedule_organization(db, organization_id, dry_run=dry_run)
+
+    if not dry_run:
+        db.commit()
+
+    return result
 
 
 @router.put("/{pickup_id}", response_model=PickupResponse)
@@ -1,15 +1,23 @@
 import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.notifications import Notifications
 from src.models.container_sites import ContainerSite
 from src.models.containers import Containers
 from src.api.auth import get_current_user
-from src.database import get_db
+from src.database import get_async_db
+from src.services.replicas import get_async_read_db
 from src.models.users import Users
 from src.schemas.users import UserCreate, UserResponse
-from src.api.core import hash_password
+from src.api.core import hash_password_async
+from src.services.identity_cache import identity_cache
+from src.services.notifications import (
+    user_notifications_query,
+    mark_notifications_read,
+    unread_notifications_count
+)
 
 router = APIRouter(
     prefix="/users",
@@ -18,13 +26,13 @@ router = APIRouter(
 
 
 @router.post("/register", status_code=201)
-def register_user(data: UserCreate, db: Session = Depends(get_db)):
+async def register_user(data: UserCreate, db: AsyncSession = Depends(get_async_db)):
 
-    existing = db.query(Users).filter(Users.email == data.email).first()
+    existing = await db.scalar(select(Users).where(Users.email == data.email))
     if existing:
         raise HTTPException(409, "User with this email already exists")
 
-    hashed_password = hash_password(data.password)
+    hashed_password = await hash_password_async(data.password)
 
     new_user = Users(
         first_name=data.first_name,
@@ -37,8 +45,8 @@ def register_user(data: UserCreate, db: Session = Depends(get_db)):
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
     return {"message": "User registered successfully", "user_id": new_user.user_id}
 
@@ -47,16 +55,16 @@ def register_user(data: UserCreate, db: Session = Depends(get_db)):
     "/container-sites",
     summary="View container sites"
 )
-def get_container_sites(
-    db: Session = Depends(get_db),
+async def get_container_sites(
+    db: AsyncSession = Depends(get_async_read_db),
     current=Depends(get_current_user)
 ):
     entity, role = current
 
-    query = db.query(ContainerSite)
+    statement = select(ContainerSite)
 
     if role == "user":
-        query = query.filter(
+        statement = statement.where(
             ContainerSite.city.ilike(entity.city)
         )
     elif role == "admin":
@@ -67,7 +75,7 @@ def get_container_sites(
             detail="Access denied"
         )
 
-    sites = query.all()
+    sites = (await db.scalars(statement)).all()
 
     if not sites:
         raise HTTPException(
@@ -82,15 +90,15 @@ def get_container_sites(
     "/containers",
     summary="Search containers by waste type"
 )
-def search_containers_by_type(
+async def search_containers_by_type(
     waste_type: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current=Depends(get_current_user)
 ):
     entity, role = current
 
-    query = (
-        db.query(
+    statement = (
+        select(
             Containers.container_id,
             Containers.type,
             Containers.fill_level,
@@ -101,11 +109,11 @@ def search_containers_by_type(
             ContainerSite.building
         )
         .join(ContainerSite)
-        .filter(Containers.type.ilike(waste_type))
+        .where(Containers.type.ilike(waste_type))
     )
 
     if role == "user":
-        query = query.filter(
+        statement = statement.where(
             ContainerSite.city.ilike(entity.city)
         )
     elif role == "admin":
@@ -113,7 +121,7 @@ def search_containers_by_type(
     else:
         raise HTTPException(403, "Access denied")
 
-    containers = query.all()
+    containers = (await db.execute(statement)).all()
 
     if not containers:
         raise HTTPException(
@@ -141,19 +149,19 @@ def search_containers_by_type(
     "/container-sites/{site_id}/containers",
     summary="View containers by container site"
 )
-def get_containers_by_site(
+async def get_containers_by_site(
     site_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current=Depends(get_current_user)
 ):
     entity, role = current
 
-    site_query = db.query(ContainerSite).filter(
+    site_query = select(ContainerSite).where(
         ContainerSite.container_site_id == site_id
     )
 
     if role == "user":
-        site_query = site_query.filter(
+        site_query = site_query.where(
             ContainerSite.city.ilike(entity.city)
         )
     elif role == "admin":
@@ -161,16 +169,14 @@ def get_containers_by_site(
     else:
         raise HTTPException(403, "Access denied")
 
-    site = site_query.first()
+    site = await db.scalar(site_query)
 
     if not site:
         raise HTTPException(404, "Container site not found")
 
-    containers = (
-        db.query(Containers)
-        .filter(Containers.container_site_id == site_id)
-        .all()
-    )
+    containers = (await db.scalars(
+        select(Containers).where(Containers.container_site_id == site_id)
+    )).all()
 
     return {
         "container_site_id": site.container_site_id,
@@ -192,55 +198,82 @@ def get_containers_by_site(
     "/notifications/container-sites",
     summary="Notifications about new container sites in user's city"
 )
-def new_container_site_notifications(
-    db: Session = Depends(get_db),
+async def new_container_site_notifications(
+    db: AsyncSession = Depends(get_async_db),
     current=Depends(get_current_user)
 ):
     user, role = current
 
-    notifications = (
-        db.query(Notifications)
-        .join(
-            ContainerSite,
-            Notifications.container_site_id == ContainerSite.container_site_id
-        )
-        .filter(
-            Notifications.message_type == "new_container_site",
-            ContainerSite.city == user.city,
-            Notifications.user_id == user.user_id
-        )
+    if role != "user":
+        raise HTTPException(403, "Access denied")
+
+    return await db.run_sync(
+        lambda session: user_notifications_query(session, user, "new_container_site")
         .order_by(Notifications.created_at.desc())
         .all()
     )
 
-    return notifications
-
 
 @router.get(
     "/notifications/collection",
     summary="Waste collection notifications for current user"
 )
-def waste_collection_notifications(
-    db: Session = Depends(get_db),
+async def waste_collection_notifications(
+    db: AsyncSession = Depends(get_async_db),
     current=Depends(get_current_user)
 ):
     user, role = current
 
-    return (
-        db.query(Notifications)
-        .filter(
-            Notifications.user_id == user.user_id,
-            Notifications.message_type == "waste_collection"
-        )
+    if role != "user":
+        raise HTTPException(403, "Access denied")
+
+    return await db.run_sync(
+        lambda session: user_notifications_query(session, user, "waste_collection")
         .order_by(Notifications.created_at.desc())
         .all()
     )
 
 
+@router.get(
+    "/notifications/unread-count",
+    summary="Number of unread notifications for current user"
+)
+async def unread_notifications(
+    db: AsyncSession = Depends(get_async_db),
+    current=Depends(get_current_user)
+):
+    user, role = current
+
+    if role != "user":
+        raise HTTPException(403, "Access denied")
+
+    return {"unread": await db.run_sync(unread_notifications_count, user)}
+
+
+@router.post(
+    "/notifications/read",
+    summary="Mark notifications as read"
+)
+async def read_notifications(
+    db: AsyncSession = Depends(get_async_db),
+    current=Depends(get_current_user)
+):
+    user, role = current
+
+    if role != "user":
+        raise HTTPException(403, "Access denied")
+
+    cursor = await db.run_sync(
+        mark_notifications_read, user, datetime.datetime.utcnow()
+    )
+
+    return {"last_read_at": cursor.last_read_at}
+
+
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(
+async def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current=Depends(get_current_user)
 ):
     entity, role = current
@@ -253,7 +286,7 @@ def get_user(
             detail="Access denied"
         )
 
-    user = db.query(Users).filter(Users.user_id == user_id).first()
+    user = await db.get(Users, user_id)
     if not user:
         raise HTTPException(404, "User not found")
 
@@ -261,10 +294,10 @@ def get_user(
 
 
 @router.put("/{user_id}", response_model=UserResponse)
-def update_user(
+async def update_user(
     user_id: int,
     data: UserCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current=Depends(get_current_user)
 ):
     entity, role = current
@@ -277,7 +310,7 @@ def update_user(
             detail="Access denied"
         )
 
-    user = db.query(Users).filter(Users.user_id == user_id).first()
+    user = await db.get(Users, user_id)
     if not user:
         raise HTTPException(404, "User not found")
 
@@ -285,7 +318,9 @@ def update_user(
     for field, value in update_data.items():
         setattr(user, field, value)
 
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+
+    identity_cache.invalidate("user", user_id)
 
     return user
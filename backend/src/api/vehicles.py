@@ -11,6 +11,8 @@ from src.schemas.vehicles import (
     VehicleResponse
 )
 from src.api.auth import get_current_user
+from src.api.pagination import PageParams, paginate
+from src.schemas.pagination import Page
 from src.models.users import Users
 
 router = APIRouter(
@@ -59,7 +61,8 @@ def create_vehicle(
     vehicle = Vehicles(
         vehicle_name=data.vehicle_name,
         number_plate=data.number_plate,
-        organization_id=organization_id
+        organization_id=organization_id,
+        daily_capacity=data.daily_capacity
     )
 
     db.add(vehicle)
@@ -69,20 +72,22 @@ def create_vehicle(
     return vehicle
 
 
-@router.get("/", response_model=List[VehicleResponse])
+@router.get("/", response_model=Page[VehicleResponse])
 def get_vehicles(
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current=Depends(get_current_user)
 ):
     entity, role = current
 
     if role == "admin":
-        return db.query(Vehicles).all()
+        return paginate(db.query(Vehicles), page, Vehicles.vehicle_id)
 
     if role == "organization":
-        return db.query(Vehicles).filter(
+        query = db.query(Vehicles).filter(
             Vehicles.organization_id == entity.organization_id
-        ).all()
+        )
+        return paginate(query, page, Vehicles.vehicle_id)
 
     raise HTTPException(403, "Access denied")
 
@@ -150,6 +155,9 @@ def update_vehicle(
     if data.number_plate is not None:
         vehicle.number_plate = data.number_plate
 
+    if data.daily_capacity is not None:
+        vehicle.daily_capacity = data.daily_capacity
+
     db.commit()
     db.refresh(vehicle)
 
@@ -1,6 +1,14 @@
+import hashlib
 import os
-from sqlalchemy import create_engine
+import threading
+import time
+from contextvars import ContextVar
+from uuid import uuid4
+from fastapi import Request
+from sqlalchemy import create_engine, exc
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,7 +20,161 @@ DATABASE_URL = (
     f"{os.getenv('DB_NAME')}?sslmode=require"
 )
 
-engine = create_engine(DATABASE_URL, echo=False)
+ASYNC_DATABASE_URL = (
+    f"postgresql+asyncpg://{os.getenv('DB_USER')}:"
+    f"{os.getenv('DB_PASSWORD')}@"
+    f"{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/"
+    f"{os.getenv('DB_NAME')}"
+)
+
+# "null" — без власного пулу, з'єднання тримає зовнішній пулер
+# (pgbouncer/Supabase pooler) у serverless-розгортанні (versel.json)
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "queue").lower()
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+# керовані Postgres рвуть неактивні SSL-з'єднання, тому їх варто оновлювати раніше
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+
+class PoolStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {
+            "checkouts": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+            "overflow_opened": 0,
+            "overflow_exhausted": 0,
+            "timeouts": 0,
+        }
+
+    def checkout(self, wait: float):
+        with self._lock:
+            self._stats["checkouts"] += 1
+            self._stats["wait_seconds_total"] += wait
+            self._stats["wait_seconds_max"] = max(
+                self._stats["wait_seconds_max"], wait)
+
+    def add(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+
+        stats["wait_seconds_avg"] = (
+            stats["wait_seconds_total"] / (stats["checkouts"] or 1)
+        )
+        stats["mode"] = DB_POOL_MODE
+
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "pool_size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+            })
+
+        return stats
+
+
+pool_stats = PoolStats()
+async_pool_stats = PoolStats()
+
+# глибина вкладених _do_get у поточному потоці чи asyncio-задачі
+_checkout_depth = ContextVar("pool_checkout_depth", default=0)
+
+
+# QueuePool, що рахує час очікування з'єднання та події переповнення
+class InstrumentedQueuePool(QueuePool):
+    stats = pool_stats
+
+    def _do_get(self):
+        # QueuePool._do_get повторно викликає себе при повторних спробах;
+        # рахується лише зовнішній виклик
+        depth = _checkout_depth.get()
+        token = _checkout_depth.set(depth + 1)
+
+        try:
+            if depth:
+                return super()._do_get()
+
+            return self._measured_get()
+        finally:
+            _checkout_depth.reset(token)
+
+    def _measured_get(self):
+        started_at = time.perf_counter()
+
+        # вільних з'єднань немає, а ліміт переповнення вичерпано — запит чекатиме
+        if self._max_overflow > -1 and self._pool.empty() \
+                and self._overflow >= self._max_overflow:
+            self.stats.add("overflow_exhausted")
+
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.add("timeouts")
+            raise
+
+        self.stats.checkout(time.perf_counter() - started_at)
+        return connection
+
+    def _inc_overflow(self):
+        opened = super()._inc_overflow()
+
+        if opened and self._overflow > 0:
+            self.stats.add("overflow_opened")
+
+        return opened
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool, InstrumentedQueuePool):
+    stats = async_pool_stats
+
+
+def engine_options(poolclass=InstrumentedQueuePool) -> dict:
+    if DB_POOL_MODE == "null":
+        # psycopg2 не використовує серверні prepared statements,
+        # тож із transaction-пулером достатньо не тримати з'єднання
+        return {"poolclass": NullPool}
+
+    return {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def async_connect_args() -> dict:
+    args = {"ssl": "require"}
+
+    if DB_POOL_MODE == "null":
+        # transaction-пулер передає запити різним серверним з'єднанням,
+        # тому кеш prepared statements asyncpg вимикається, а імена
+        # операторів робляться унікальними
+        args["statement_cache_size"] = 0
+        args["prepared_statement_cache_size"] = 0
+        args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+
+    return args
+
+
+engine = create_engine(DATABASE_URL, echo=False, **engine_options())
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=False,
+    connect_args=async_connect_args(),
+    **engine_options(InstrumentedAsyncQueuePool)
+)
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -20,14 +182,37 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 
 class Base(DeclarativeBase):
     pass
 
 
-def get_db():
+# Ключ клієнта для read-your-writes: токен (хешований) або IP-адреса
+def request_client(request: Request) -> str | None:
+    authorization = request.headers.get("authorization")
+
+    if authorization:
+        return hashlib.sha256(authorization.encode()).hexdigest()
+
+    return request.client.host if request.client else None
+
+
+def get_db(request: Request):
     db = SessionLocal()
+    db.info["client"] = request_client(request)
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db(request: Request):
+    async with AsyncSessionLocal() as db:
+        db.info["client"] = request_client(request)
+        yield db
@@ -1,14 +1,45 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from src.api import users, devices, containers, organizations, disposal_requests
 from src.api import auth, client_companies, vehicles, container_sites, admin, pickups
-from src.api import analytics, doc
+from src.api import analytics, doc, jobs, metrics, exports
+from src.api.core import password_pool
+from src.database import async_engine
+from src.services.pdf import pdf_renderer
+from src.services.jobs import start_periodic_jobs, stop_periodic_jobs, job_registry
+from src.services.login_index import ensure_login_index
+from src.services.telemetry_history import prepare_partitions
+from src.services.query_stats import QueryStatsMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # секції telemetry_history мають існувати до першого показання
+    await run_in_threadpool(prepare_partitions)
+    if devices.TELEMETRY_BUFFERED:
+        devices.telemetry_buffer.start()
+    start_periodic_jobs()
+    # заповнюємо індекс входу, якщо він ще порожній
+    job_registry.submit("login_index_ensure", ensure_login_index)
+
+    yield
+
+    await run_in_threadpool(stop_periodic_jobs)
+    await run_in_threadpool(job_registry.shutdown)
+    await run_in_threadpool(password_pool.shutdown)
+    await run_in_threadpool(pdf_renderer.shutdown)
+    # дописуємо буфер телеметрії перед зупинкою
+    await run_in_threadpool(devices.telemetry_buffer.stop)
+    await async_engine.dispose()
 
 
 app = FastAPI(
     title="Ecofy 🍀 ",
     description="Ecofy — система для управління утилізацією та вивезенням відходів",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 origins = [
@@ -22,8 +53,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-DB-Query-Count", "X-DB-Time-Ms", "X-DB-Repeated-Queries"],
 )
 
+app.add_middleware(QueryStatsMiddleware)
+
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(client_companies.router)
@@ -37,6 +71,9 @@ app.include_router(disposal_requests.router)
 app.include_router(pickups.router)
 app.include_router(analytics.router)
 app.include_router(doc.router)
+app.include_router(jobs.router)
+app.include_router(metrics.router)
+app.include_router(exports.router)
 
 
 @app.get("/")
@@ -4,8 +4,12 @@ from .client_companies import ClientCompanies
 from .vehicles import Vehicles
 from .container_sites import ContainerSite
 from .containers import Containers
-from .pickups import Pickups
+from .pickups import Pickups, SiteFillProjections
 from .devices import Devices
-from .notifications import Notifications
+from .notifications import Notifications, NotificationCursors
 from .disposal_requests import DisposalRequests
 from .admin import Admins
+from .telemetry import TelemetryHistory, TelemetryRollups
+from .alerts import AlertStates
+from .login_index import LoginIndex
+from .analytics import OrganizationStats, ClientCompanyStats
@@ -10,4 +10,4 @@ class Admins(Base):
     first_name = Column(String(100), nullable=False)
     patronymic = Column(String(100))
     password_hash = Column(String(255), nullable=False)
-    email = Column(String(150), nullable=False)
+    email = Column(String(150), nullable=False, index=True)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, Integer, String
+from src.database import Base
+
+
+# Поточний стан активних сповіщень; рядок існує лише поки умова триває
+class AlertStates(Base):
+    __tablename__ = "alert_states"
+
+    rule = Column(String(20), primary_key=True)
+    subject_id = Column(Integer, primary_key=True)
+    level = Column(String(20), nullable=False)
+    changed_at = Column(DateTime, nullable=False)
+    notified_at = Column(DateTime, nullable=False)
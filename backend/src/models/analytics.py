@@ -0,0 +1,28 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
+from src.database import Base
+
+
+# Попередньо обчислена статистика організацій для /analytics/organizations
+class OrganizationStats(Base):
+    __tablename__ = "organization_stats"
+
+    organization_id = Column(Integer, ForeignKey(
+        "organization.organization_id", ondelete="CASCADE"), primary_key=True)
+    total_requests = Column(Integer, nullable=False, default=0)
+    completed_requests = Column(Integer, nullable=False, default=0)
+    container_sites = Column(Integer, nullable=False, default=0)
+    containers = Column(Integer, nullable=False, default=0)
+    last_activity = Column(DateTime)
+    refreshed_at = Column(DateTime, nullable=False)
+
+
+# Лічильники заявок клієнтських компаній, що оновлюються разом із заявками
+class ClientCompanyStats(Base):
+    __tablename__ = "client_company_stats"
+
+    client_id = Column(Integer, ForeignKey(
+        "clientcompanies.client_id", ondelete="CASCADE"), primary_key=True)
+    total_requests = Column(Integer, nullable=False, default=0)
+    completed_requests = Column(Integer, nullable=False, default=0)
+    active_requests = Column(Integer, nullable=False, default=0)
+    last_activity = Column(DateTime)
@@ -1,14 +1,17 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey, String, Text
+from sqlalchemy import Column, Integer, Float, ForeignKey, Index, String, Text, event
 from sqlalchemy.orm import relationship
 from src.database import Base
+from src.services.geo import encode_geohash
 
 
 class ContainerSite(Base):
     __tablename__ = "containersite"
 
     container_site_id = Column(Integer, primary_key=True, index=True)
-    location_lat = Column(String(100), nullable=False)
-    location_lng = Column(String(100), nullable=False)
+    location_lat = Column(Float, nullable=False)
+    location_lng = Column(Float, nullable=False)
+    # geohash координат для пошуку поблизу за префіксом через B-tree індекс
+    geohash = Column(String(12))
     city = Column(String(100))
     street = Column(String(100))
     building = Column(String(20))
@@ -16,7 +19,7 @@ class ContainerSite(Base):
     description = Column(Text)
 
     organization_id = Column(Integer, ForeignKey(
-        "organization.organization_id", ondelete="CASCADE"))
+        "organization.organization_id", ondelete="CASCADE"), index=True)
 
     organization = relationship(
         "Organization", back_populates="containersite")
@@ -24,3 +27,21 @@ class ContainerSite(Base):
     pickups = relationship("Pickups", back_populates="containersite")
     notifications = relationship(
         "Notifications", back_populates="containersite")
+
+    __table_args__ = (
+        Index(
+            "ix_containersite_geohash",
+            "geohash",
+            postgresql_ops={"geohash": "varchar_pattern_ops"}
+        ),
+    )
+
+
+@event.listens_for(ContainerSite, "before_insert")
+@event.listens_for(ContainerSite, "before_update")
+def _set_geohash(mapper, connection, target):
+    if target.location_lat is not None and target.location_lng is not None:
+        target.geohash = encode_geohash(
+            float(target.location_lat),
+            float(target.location_lng)
+        )
@@ -17,7 +17,7 @@ class Containers(Base):
     last_update = Column(DateTime, default=datetime.utcnow)
 
     container_site_id = Column(Integer, ForeignKey(
-        "containersite.container_site_id", ondelete="CASCADE"))
+        "containersite.container_site_id", ondelete="CASCADE"), index=True)
 
     containersite = relationship("ContainerSite", back_populates="containers")
     devices = relationship("Devices", back_populates="container")
@@ -9,7 +9,7 @@ class Devices(Base):
 
     device_id = Column(Integer, primary_key=True, index=True)
     device_name = Column(String(100), nullable=False)
-    serial_number = Column(String(100), nullable=False)
+    serial_number = Column(String(100), nullable=False, unique=True, index=True)
     device_type = Column(String(50))
     last_signal = Column(
         TIMESTAMP,
@@ -20,6 +20,6 @@ class Devices(Base):
     status = Column(String(50))
 
     container_id = Column(Integer, ForeignKey(
-        "containers.container_id", ondelete="SET NULL"))
+        "containers.container_id", ondelete="SET NULL"), index=True)
 
     container = relationship("Containers", back_populates="devices")
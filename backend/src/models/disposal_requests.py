@@ -16,9 +16,9 @@ class DisposalRequests(Base):
     status = Column(String(50))
 
     organization_id = Column(Integer, ForeignKey(
-        "organization.organization_id", ondelete="CASCADE"))
+        "organization.organization_id", ondelete="CASCADE"), index=True)
     client_id = Column(Integer, ForeignKey(
-        "clientcompanies.client_id", ondelete="CASCADE"))
+        "clientcompanies.client_id", ondelete="CASCADE"), index=True)
 
     organization = relationship(
         "Organization", back_populates="disposal_requests")
@@ -0,0 +1,13 @@
+from sqlalchemy import Boolean, Column, Integer, String
+from src.database import Base
+
+
+# Спільний індекс облікових записів усіх ролей для входу одним запитом
+class LoginIndex(Base):
+    __tablename__ = "login_index"
+
+    email = Column(String(150), primary_key=True)
+    role = Column(String(20), primary_key=True)
+    account_id = Column(Integer, nullable=False)
+    password_hash = Column(String(255), nullable=False)
+    status = Column(Boolean, nullable=False, default=True)
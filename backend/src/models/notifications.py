@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from src.database import Base
@@ -13,12 +13,35 @@ class Notifications(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     user_id = Column(Integer, ForeignKey("users.user_id", ondelete="CASCADE"))
+    # місто для загальноміських сповіщень (user_id при цьому порожній)
+    city = Column(String(100))
     container_id = Column(Integer, ForeignKey(
         "containers.container_id"), nullable=True)
     container_site_id = Column(Integer, ForeignKey(
-        "containersite.container_site_id", ondelete="SET NULL"))
+        "containersite.container_site_id", ondelete="SET NULL"), index=True)
 
     user = relationship("Users", back_populates="notifications")
     containersite = relationship(
         "ContainerSite", back_populates="notifications")
     container = relationship("Containers", back_populates="notifications")
+
+    __table_args__ = (
+        Index(
+            "ix_notifications_user_type_created",
+            "user_id", "message_type", created_at.desc()
+        ),
+        Index(
+            "ix_notifications_city_created",
+            "city", created_at.desc(),
+            postgresql_where=user_id.is_(None)
+        ),
+    )
+
+
+# Позиція, до якої користувач прочитав свої сповіщення
+class NotificationCursors(Base):
+    __tablename__ = "notification_cursors"
+
+    user_id = Column(Integer, ForeignKey(
+        "users.user_id", ondelete="CASCADE"), primary_key=True)
+    last_read_at = Column(DateTime, nullable=False)
@@ -13,7 +13,7 @@ class Organization(Base):
     street = Column(String(100))
     building = Column(String(20))
     phone_number = Column(String(20))
-    email = Column(String(150), nullable=False)
+    email = Column(String(150), nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
     edrpou = Column(String(20))
     status = Column(Boolean, default=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from src.database import Base
 
@@ -11,9 +11,26 @@ class Pickups(Base):
     completed_time = Column(DateTime)
 
     container_site_id = Column(Integer, ForeignKey(
-        "containersite.container_site_id", ondelete="CASCADE"))
+        "containersite.container_site_id", ondelete="CASCADE"), index=True)
     vehicle_id = Column(Integer, ForeignKey(
         "vehicles.vehicle_id", ondelete="SET NULL"))
 
     containersite = relationship("ContainerSite", back_populates="pickups")
     vehicle = relationship("Vehicles", back_populates="pickups")
+
+    __table_args__ = (
+        Index("ix_pickups_scheduled_time", "scheduled_time"),
+        Index("ix_pickups_vehicle_scheduled", "vehicle_id", "scheduled_time"),
+    )
+
+
+# Прогноз заповнення майданчика, за яким планувальник вирішує,
+# чи потрібно переоцінювати майданчик при наступному запуску
+class SiteFillProjections(Base):
+    __tablename__ = "site_fill_projections"
+
+    container_site_id = Column(Integer, ForeignKey(
+        "containersite.container_site_id", ondelete="CASCADE"), primary_key=True)
+    organization_id = Column(Integer, index=True)
+    due_at = Column(DateTime, index=True)
+    evaluated_at = Column(DateTime, nullable=False)
@@ -0,0 +1,30 @@
+from sqlalchemy import REAL, Boolean, Column, DateTime, Integer, SmallInteger
+from src.database import Base
+
+
+# Сирі показання датчиків, секціоновані по днях (див. services/telemetry_history.py)
+class TelemetryHistory(Base):
+    __tablename__ = "telemetry_history"
+    __table_args__ = {"postgresql_partition_by": "RANGE (recorded_at)"}
+
+    container_id = Column(Integer, primary_key=True)
+    recorded_at = Column(DateTime, primary_key=True)
+    fill_level = Column(SmallInteger)
+    temperature = Column(REAL)
+    tilted = Column(Boolean)
+    battery_level = Column(SmallInteger)
+
+
+# Агреговані показання за 5-хвилинними та годинними інтервалами
+class TelemetryRollups(Base):
+    __tablename__ = "telemetry_rollups"
+
+    container_id = Column(Integer, primary_key=True)
+    bucket_seconds = Column(Integer, primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    samples = Column(Integer, nullable=False)
+    min_fill = Column(SmallInteger)
+    max_fill = Column(SmallInteger)
+    avg_fill = Column(REAL)
+    max_temperature = Column(REAL)
+    tilt_count = Column(Integer, nullable=False, default=0)
@@ -12,8 +12,8 @@ class Users(Base):
     patronymic = Column(String(100))
     password_hash = Column(String(255), nullable=False)
     phone_number = Column(String(20))
-    email = Column(String(150), nullable=False)
-    city = Column(String(100))
+    email = Column(String(150), nullable=False, index=True)
+    city = Column(String(100), index=True)
     status = Column(Boolean, default=True)
 
     notifications = relationship("Notifications", back_populates="user")
@@ -9,8 +9,10 @@ class Vehicles(Base):
     vehicle_id = Column(Integer, primary_key=True, index=True)
     vehicle_name = Column(String(100))
     number_plate = Column(String(20), unique=True, nullable=False)
+    # скільки майданчиків машина може обслужити за день
+    daily_capacity = Column(Integer)
 
     organization_id = Column(Integer, ForeignKey(
-        "containersite.container_site_id", ondelete="CASCADE"))
+        "containersite.container_site_id", ondelete="CASCADE"), index=True)
 
     pickups = relationship("Pickups", back_populates="vehicle")
@@ -1,11 +1,11 @@
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 
 
 class ContainerSiteBase(BaseModel):
-    location_lat: str
-    location_lng: str
+    location_lat: float = Field(ge=-90, le=90)
+    location_lng: float = Field(ge=-180, le=180)
     city: str | None = None
     street: str | None = None
     building: str | None = None
@@ -18,8 +18,8 @@ class ContainerSiteCreate(ContainerSiteBase):
 
 
 class ContainerSiteUpdate(BaseModel):
-    location_lat: str | None = None
-    location_lng: str | None = None
+    location_lat: float | None = Field(None, ge=-90, le=90)
+    location_lng: float | None = Field(None, ge=-180, le=180)
     city: str | None = None
     street: str | None = None
     building: str | None = None
@@ -35,6 +35,10 @@ class ContainerSiteResponse(ContainerSiteBase):
         from_attributes = True
 
 
+class NearbyContainerSiteResponse(ContainerSiteResponse):
+    distance_m: float
+
+
 class ContainerStatusResponse(BaseModel):
     container_id: int
     type: str
@@ -37,9 +37,29 @@ class NotificationResponse(BaseModel):
     notification_id: int
     message: str
     message_type: str
-    created_at: datetime
+    created_at: datetime | None = None
     container_site_id: int | None
     container_id: int | None
+    user_id: int | None = None
+    city: str | None = None
 
     class Config:
         from_attributes = True
+
+
+class TelemetryHistoryPoint(BaseModel):
+    timestamp: datetime
+    samples: int
+    min_fill: int | None = None
+    max_fill: int | None = None
+    avg_fill: float | None = None
+    max_temperature: float | None = None
+    tilt_count: int
+
+
+class ContainerForecast(BaseModel):
+    container_id: int
+    fill_level: int | None = None
+    last_update: datetime | None = None
+    fill_rate_per_hour: float | None = None
+    full_at: datetime | None = None
@@ -39,6 +39,12 @@ class DeviceTelemetry(BaseModel):
     battery_level: int | None = None
 
 
+class DeviceTelemetryResult(BaseModel):
+    serial_number: str
+    status: str
+    detail: str | None = None
+
+
 class DeviceTelemetryView(BaseModel):
     serial_number: str
     battery_level: int
@@ -4,6 +4,7 @@ from typing import List, Optional
 
 
 class WasteTransferActDTO(BaseModel):
+    request_id: Optional[int] = None
     city: str
     act_date: date
 
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from datetime import datetime
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    kind: str
+    status: str
+    total: int | None = None
+    processed: int
+    result: dict | None = None
+    error: str | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
@@ -28,3 +28,46 @@ class PickupResponse(BaseModel):
 class PickupStatisticsResponse(BaseModel):
     total_pickups: int
     completed_pickups: int
+
+
+class RouteStop(BaseModel):
+    pickup_id: int
+    container_site_id: int
+    location_lat: float
+    location_lng: float
+    scheduled_time: datetime | None = None
+    distance_km: float
+
+
+class VehicleRoute(BaseModel):
+    vehicle_id: int
+    total_distance_km: float
+    stops: list[RouteStop]
+
+
+class UnassignedPickup(BaseModel):
+    pickup_id: int
+    container_site_id: int
+    location_lat: float
+    location_lng: float
+    scheduled_time: datetime | None = None
+
+
+class DayRoutes(BaseModel):
+    routes: list[VehicleRoute]
+    unassigned: list[UnassignedPickup]
+
+
+class PickupProposal(BaseModel):
+    container_site_id: int
+    vehicle_id: int
+    scheduled_time: datetime
+    due_at: datetime
+
+
+class AutoScheduleResponse(BaseModel):
+    organization_id: int
+    evaluated_sites: int
+    created: int
+    proposals: list[PickupProposal]
+    unassigned_site_ids: list[int]
@@ -5,6 +5,7 @@ class VehicleBase(BaseModel):
     vehicle_name: str
     number_plate: str
     organization_id: int
+    daily_capacity: int | None = None
 
 
 class VehicleCreate(VehicleBase):
@@ -0,0 +1,133 @@
+import os
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from sqlalchemy import event, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.models.alerts import AlertStates
+
+ALERT_COOLDOWN_SECONDS = int(os.getenv("ALERT_COOLDOWN_SECONDS", 3600))
+
+# заповнення (%), з якого контейнер вважається повним
+FILL_LEVEL_THRESHOLD = 90
+
+RAISED = "raised"
+REPEATED = "repeated"
+RESOLVED = "resolved"
+
+
+class AlertState(NamedTuple):
+    level: str
+    changed_at: datetime
+    notified_at: datetime
+
+
+# Двигун переходів станів: сповіщення створюється лише при вході в умову,
+# виході з неї або після закінчення cooldown, а не на кожне показання.
+# Стан читається з alert_states у транзакції викликача, а не з пам'яті
+# процесу, тож воркери не розходяться між собою.
+class AlertEngine:
+    def __init__(self, cooldown: timedelta):
+        self.cooldown = cooldown
+
+    # Завантажує стани одним запитом і блокує наявні рядки до кінця
+    # транзакції. Відсутні рядки не заблокувати, тому викликач блокує
+    # й самі контейнери та пристрої.
+    def load(self, db: Session, keys: list[tuple[str, int]]):
+        states = db.info.setdefault("alert_states", {})
+        keys = [key for key in keys if key not in states]
+
+        if not keys:
+            return
+
+        states.update(dict.fromkeys(keys))
+
+        rows = db.execute(
+            select(AlertStates)
+            .where(tuple_(AlertStates.rule, AlertStates.subject_id).in_(keys))
+            .order_by(AlertStates.rule, AlertStates.subject_id)
+            .with_for_update()
+        ).scalars()
+
+        for row in rows:
+            states[(row.rule, row.subject_id)] = AlertState(
+                row.level, row.changed_at, row.notified_at
+            )
+
+    def current(self, db: Session, key: tuple[str, int]) -> AlertState | None:
+        self.load(db, [key])
+        return db.info["alert_states"][key]
+
+    def evaluate(
+        self,
+        db: Session,
+        rule: str,
+        subject_id: int,
+        level: str | None,
+        now: datetime | None = None
+    ) -> str | None:
+        now = now or datetime.utcnow()
+        key = (rule, subject_id)
+        state = self.current(db, key)
+
+        if state is None and level is None:
+            return None
+
+        if state is not None and state.level == level:
+            if now - state.notified_at < self.cooldown:
+                return None
+
+            self._stage(db, key, AlertState(level, state.changed_at, now))
+            return REPEATED
+
+        if level is None:
+            self._stage(db, key, None)
+            return RESOLVED
+
+        self._stage(db, key, AlertState(level, now, now))
+        return RAISED
+
+    def _stage(self, db: Session, key: tuple[str, int], state: AlertState | None):
+        db.info.setdefault("alert_states", {})[key] = state
+
+        rule, subject_id = key
+
+        if state is None:
+            db.query(AlertStates).filter(
+                AlertStates.rule == rule,
+                AlertStates.subject_id == subject_id
+            ).delete(synchronize_session=False)
+            return
+
+        stmt = insert(AlertStates).values(
+            rule=rule,
+            subject_id=subject_id,
+            level=state.level,
+            changed_at=state.changed_at,
+            notified_at=state.notified_at
+        )
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["rule", "subject_id"],
+            set_={
+                "level": stmt.excluded.level,
+                "changed_at": stmt.excluded.changed_at,
+                "notified_at": stmt.excluded.notified_at,
+            }
+        ))
+
+
+alert_engine = AlertEngine(timedelta(seconds=ALERT_COOLDOWN_SECONDS))
+
+
+# блокування знімаються разом із транзакцією, тож і прочитаний стан
+# у наступній транзакції читається заново
+@event.listens_for(Session, "after_commit")
+def _forget_alert_states(session):
+    session.info.pop("alert_states", None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_alert_states(session):
+    session.info.pop("alert_states", None)
@@ -0,0 +1,193 @@
+import logging
+import os
+
+from sqlalchemy import case, delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.database import SessionLocal
+from src.models.analytics import ClientCompanyStats
+from src.models.disposal_requests import DisposalRequests
+from src.services.jobs import register_periodic_job
+
+logger = logging.getLogger(__name__)
+
+CLIENT_STATS_RECONCILE_INTERVAL = float(
+    os.getenv("CLIENT_STATS_RECONCILE_INTERVAL", 86400)
+)
+
+COUNTERS = ["total_requests", "completed_requests", "active_requests"]
+
+
+def is_completed(status: str | None) -> bool:
+    return status == "completed"
+
+
+# заявка без статусу не активна і не виконана
+def is_active(status: str | None) -> bool:
+    return status is not None and status != "completed"
+
+
+# Зсуває лічильники клієнта в поточній транзакції; коміт робить викликач
+def adjust_client_stats(
+    db: Session,
+    client_id: int | None,
+    total: int = 0,
+    completed: int = 0,
+    active: int = 0,
+    activity=None
+):
+    if client_id is None:
+        return
+
+    stmt = insert(ClientCompanyStats).values(
+        client_id=client_id,
+        total_requests=max(total, 0),
+        completed_requests=max(completed, 0),
+        active_requests=max(active, 0),
+        last_activity=activity
+    )
+
+    table = ClientCompanyStats.__table__.c
+
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["client_id"],
+        set_={
+            "total_requests": table.total_requests + total,
+            "completed_requests": table.completed_requests + completed,
+            "active_requests": table.active_requests + active,
+            "last_activity": func.greatest(
+                table.last_activity, stmt.excluded.last_activity
+            ),
+        }
+    ))
+
+
+def request_created(db: Session, request: DisposalRequests):
+    adjust_client_stats(
+        db,
+        request.client_id,
+        total=1,
+        completed=int(is_completed(request.status)),
+        active=int(is_active(request.status)),
+        activity=request.created_at
+    )
+
+
+def request_status_changed(
+    db: Session,
+    request: DisposalRequests,
+    old_status: str | None
+):
+    completed = int(is_completed(request.status)) - int(is_completed(old_status))
+    active = int(is_active(request.status)) - int(is_active(old_status))
+
+    if completed or active:
+        adjust_client_stats(
+            db,
+            request.client_id,
+            completed=completed,
+            active=active
+        )
+
+
+# last_activity після видалення не зменшується; її виправляє звірка
+def request_deleted(db: Session, request: DisposalRequests):
+    adjust_client_stats(
+        db,
+        request.client_id,
+        total=-1,
+        completed=-int(is_completed(request.status)),
+        active=-int(is_active(request.status))
+    )
+
+
+def client_stats_source():
+    return (
+        select(
+            DisposalRequests.client_id,
+            func.count().label("total_requests"),
+            func.count(
+                case((DisposalRequests.status == "completed", 1))
+            ).label("completed_requests"),
+            # NULL != 'completed' дає NULL, тож заявки без статусу не рахуються
+            func.count(
+                case((DisposalRequests.status != "completed", 1))
+            ).label("active_requests"),
+            func.max(DisposalRequests.created_at).label("last_activity")
+        )
+        .where(DisposalRequests.client_id.is_not(None))
+        .group_by(DisposalRequests.client_id)
+    )
+
+
+def refresh_client_stats(connection):
+    stmt = insert(ClientCompanyStats).from_select(
+        ["client_id", *COUNTERS, "last_activity"],
+        client_stats_source()
+    )
+
+    connection.execute(stmt.on_conflict_do_update(
+        index_elements=["client_id"],
+        set_={
+            column: stmt.excluded[column]
+            for column in [*COUNTERS, "last_activity"]
+        }
+    ))
+
+
+def reconcile_client_stats(job=None):
+    db = SessionLocal()
+    try:
+        # блокує інкременти на час звірки, щоб вони не загубилися між
+        # підрахунком і перезаписом лічильників
+        db.execute(text(
+            "LOCK TABLE client_company_stats IN SHARE ROW EXCLUSIVE MODE"
+        ))
+
+        actual = {
+            row.client_id: row
+            for row in db.execute(client_stats_source())
+        }
+        stored = {
+            row.client_id: row
+            for row in db.query(ClientCompanyStats).all()
+        }
+
+        drifted = sorted(
+            client_id
+            for client_id in actual.keys() | stored.keys()
+            if client_id not in actual
+            or client_id not in stored
+            or any(
+                getattr(actual[client_id], counter)
+                != getattr(stored[client_id], counter)
+                for counter in COUNTERS
+            )
+        )
+
+        db.execute(delete(ClientCompanyStats))
+        if actual:
+            db.execute(
+                insert(ClientCompanyStats),
+                [dict(row._mapping) for row in actual.values()]
+            )
+        db.commit()
+
+        if drifted:
+            logger.warning(
+                "Client stats drift fixed for %s clients: %s",
+                len(drifted),
+                drifted
+            )
+
+        return {"clients": len(actual), "drifted": drifted}
+    finally:
+        db.close()
+
+
+client_stats_job = register_periodic_job(
+    "client-stats-reconcile",
+    CLIENT_STATS_RECONCILE_INTERVAL,
+    reconcile_client_stats
+)
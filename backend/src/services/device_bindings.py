@@ -0,0 +1,113 @@
+import os
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.models.containers import Containers
+from src.models.devices import Devices
+from src.services.cache import TTLCache
+
+DEVICE_BINDING_CACHE_SIZE = int(os.getenv("DEVICE_BINDING_CACHE_SIZE", 100000))
+DEVICE_BINDING_CACHE_TTL = float(os.getenv("DEVICE_BINDING_CACHE_TTL", 600))
+
+
+class DeviceBinding(NamedTuple):
+    device_id: int
+    container_id: int | None
+    container_site_id: int | None
+
+
+# serial_number -> DeviceBinding
+device_bindings = TTLCache(
+    max_size=DEVICE_BINDING_CACHE_SIZE,
+    ttl=DEVICE_BINDING_CACHE_TTL
+)
+
+
+def resolve_bindings(db: Session, serial_numbers) -> dict[str, DeviceBinding]:
+    bindings = {}
+    missing = []
+
+    for serial_number in set(serial_numbers):
+        binding = device_bindings.get(serial_number)
+        if binding is None:
+            missing.append(serial_number)
+        else:
+            bindings[serial_number] = binding
+
+    if not missing:
+        return bindings
+
+    rows = (
+        db.query(
+            Devices.serial_number,
+            Devices.device_id,
+            Devices.container_id,
+            Containers.container_site_id
+        )
+        .outerjoin(Containers, Containers.container_id == Devices.container_id)
+        .filter(Devices.serial_number.in_(missing))
+        .all()
+    )
+
+    for row in rows:
+        binding = DeviceBinding(
+            row.device_id,
+            row.container_id,
+            row.container_site_id
+        )
+        device_bindings.set(row.serial_number, binding)
+        bindings[row.serial_number] = binding
+
+    return bindings
+
+
+# Кеш окремий у кожному процесі, і invalidate_* чистить лише поточний, тож
+# перед записом прив'язки звіряються з рядками пристроїв. Рядки блокуються
+# до кінця транзакції; зниклі пристрої не потрапляють у результат.
+def verify_bindings(
+    db: Session,
+    bindings: dict[str, DeviceBinding]
+) -> dict[str, DeviceBinding]:
+    if not bindings:
+        return {}
+
+    rows = db.execute(
+        select(
+            Devices.serial_number,
+            Devices.device_id,
+            Devices.container_id,
+            Containers.container_site_id
+        )
+        .outerjoin(Containers, Containers.container_id == Devices.container_id)
+        .where(Devices.device_id.in_(
+            sorted({binding.device_id for binding in bindings.values()})
+        ))
+        .order_by(Devices.device_id)
+        .with_for_update(of=Devices)
+    ).all()
+
+    current = {}
+    for row in rows:
+        binding = DeviceBinding(row.device_id, row.container_id, row.container_site_id)
+        device_bindings.set(row.serial_number, binding)
+
+        # пристрій міг отримати інший серійний номер
+        if row.serial_number in bindings:
+            current[row.serial_number] = binding
+
+    for serial_number in bindings.keys() - current.keys():
+        invalidate_device(serial_number)
+
+    return current
+
+
+def invalidate_device(serial_number: str):
+    device_bindings.delete(serial_number)
+
+
+def invalidate_container(container_id: int):
+    device_bindings.delete_where(
+        lambda serial_number, binding: binding.container_id == container_id
+    )
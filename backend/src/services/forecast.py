@@ -0,0 +1,140 @@
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.models.telemetry import TelemetryRollups
+from src.services.alerts import FILL_LEVEL_THRESHOLD
+from src.services.cache import TTLCache
+from src.services.telemetry_history import BUCKET_5M
+
+FORECAST_WINDOW_HOURS = float(os.getenv("FORECAST_WINDOW_HOURS", 24))
+FORECAST_CACHE_SIZE = int(os.getenv("FORECAST_CACHE_SIZE", 50000))
+FORECAST_CACHE_TTL = float(os.getenv("FORECAST_CACHE_TTL", 3600))
+# падіння заповнення на стільки відсотків вважається вивозом
+FORECAST_RESET_DROP = float(os.getenv("FORECAST_RESET_DROP", 20))
+FORECAST_BATCH_SIZE = int(os.getenv("FORECAST_BATCH_SIZE", 5000))
+
+# container_id -> (last_update, прогноз); прогноз перераховується лише
+# коли в контейнера з'являється нове показання
+forecast_cache = TTLCache(max_size=FORECAST_CACHE_SIZE, ttl=FORECAST_CACHE_TTL)
+
+
+# Нахил лінійної регресії (% за годину) для всіх контейнерів за один прохід.
+# Враховуються лише точки після останнього вивозу кожного контейнера
+def fill_rates(ids: np.ndarray, hours: np.ndarray, fill: np.ndarray, groups: int) -> np.ndarray:
+    rates = np.full(groups, np.nan)
+    if len(ids) == 0:
+        return rates
+
+    order = np.lexsort((hours, ids))
+    ids, hours, fill = ids[order], hours[order], fill[order]
+
+    same = np.r_[False, ids[1:] == ids[:-1]]
+    reset = same & (np.r_[0.0, np.diff(fill)] <= -FORECAST_RESET_DROP)
+
+    positions = np.arange(len(ids))
+    last_reset = np.zeros(groups, dtype=int)
+    np.maximum.at(last_reset, ids[reset], positions[reset])
+    keep = positions >= last_reset[ids]
+
+    ids, hours, fill = ids[keep], hours[keep], fill[keep]
+
+    n = np.bincount(ids, minlength=groups).astype(float)
+    st = np.bincount(ids, hours, minlength=groups)
+    sy = np.bincount(ids, fill, minlength=groups)
+    stt = np.bincount(ids, hours * hours, minlength=groups)
+    sty = np.bincount(ids, hours * fill, minlength=groups)
+
+    denominator = n * stt - st * st
+    valid = (n >= 2) & (denominator > 1e-9)
+    rates[valid] = (n * sty - st * sy)[valid] / denominator[valid]
+    return rates
+
+
+def full_at(fill_level, last_update, rate):
+    if fill_level is None or last_update is None:
+        return None
+
+    if fill_level >= FILL_LEVEL_THRESHOLD:
+        return last_update
+
+    if rate is None or rate <= 0:
+        return None
+
+    return last_update + timedelta(hours=(FILL_LEVEL_THRESHOLD - fill_level) / rate)
+
+
+def compute_forecasts(db: Session, containers: list, now: datetime) -> dict:
+    index = {c.container_id: i for i, c in enumerate(containers)}
+    origin = now - timedelta(hours=FORECAST_WINDOW_HOURS)
+
+    rows = db.execute(
+        select(
+            TelemetryRollups.container_id,
+            TelemetryRollups.bucket_start,
+            TelemetryRollups.avg_fill
+        )
+        .where(
+            TelemetryRollups.container_id.in_(list(index)),
+            TelemetryRollups.bucket_seconds == BUCKET_5M,
+            TelemetryRollups.bucket_start >= origin
+        )
+    ).all()
+
+    # поточне показання контейнера додається як найсвіжіша точка
+    points = [
+        (index[r.container_id], r.bucket_start, r.avg_fill)
+        for r in rows if r.avg_fill is not None
+    ] + [
+        (index[c.container_id], c.last_update, c.fill_level)
+        for c in containers
+        if c.fill_level is not None and c.last_update is not None
+        and c.last_update >= origin
+    ]
+
+    ids = np.array([p[0] for p in points], dtype=int)
+    hours = np.array(
+        [(p[1] - origin).total_seconds() / 3600 for p in points], dtype=float)
+    fill = np.array([p[2] for p in points], dtype=float)
+
+    rates = fill_rates(ids, hours, fill, len(containers))
+
+    forecasts = {}
+    for c, rate in zip(containers, rates):
+        rate = None if np.isnan(rate) else round(float(rate), 3)
+        forecasts[c.container_id] = {
+            "container_id": c.container_id,
+            "fill_level": c.fill_level,
+            "last_update": c.last_update,
+            "fill_rate_per_hour": rate,
+            "full_at": full_at(c.fill_level, c.last_update, rate),
+        }
+
+    return forecasts
+
+
+# containers — рядки з container_id, fill_level та last_update
+def forecast_containers(db: Session, containers: list, now: datetime | None = None) -> list[dict]:
+    now = now or datetime.utcnow()
+
+    results = {}
+    stale = []
+
+    for c in containers:
+        cached = forecast_cache.get(c.container_id)
+        if cached is not None and cached[0] == c.last_update:
+            results[c.container_id] = cached[1]
+        else:
+            stale.append(c)
+
+    for start in range(0, len(stale), FORECAST_BATCH_SIZE):
+        batch = stale[start:start + FORECAST_BATCH_SIZE]
+
+        for container_id, forecast in compute_forecasts(db, batch, now).items():
+            forecast_cache.set(container_id, (forecast["last_update"], forecast))
+            results[container_id] = forecast
+
+    return [results[c.container_id] for c in containers]
@@ -0,0 +1,100 @@
+import math
+
+import numpy as np
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9
+METERS_PER_DEGREE = 111_320.0
+
+
+def encode_geohash(lat: float, lng: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+
+    while len(chars) < precision:
+        target, bounds = (lng, lng_range) if even else (lat, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+
+        value <<= 1
+        if target >= middle:
+            value |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+
+        even = not even
+        bits += 1
+
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits = 0
+            value = 0
+
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> tuple[float, float]:
+    lat_bits = 5 * precision // 2
+    lng_bits = 5 * precision - lat_bits
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+# Найдовший префікс, комірка якого не менша за радіус: тоді всі точки
+# в радіусі лежать у центральній комірці або в одній із восьми сусідніх
+def covering_prefixes(lat: float, lng: float, radius_m: float) -> set[str]:
+    precision = 1
+
+    for candidate in range(GEOHASH_PRECISION, 0, -1):
+        lat_step, lng_step = cell_size(candidate)
+        height = lat_step * METERS_PER_DEGREE
+        width = lng_step * METERS_PER_DEGREE * math.cos(math.radians(lat))
+
+        if min(height, width) >= radius_m:
+            precision = candidate
+            break
+
+    lat_step, lng_step = cell_size(precision)
+
+    return {
+        encode_geohash(
+            max(-90.0, min(90.0, lat + dy * lat_step)),
+            (lng + dx * lng_step + 180.0) % 360.0 - 180.0,
+            precision
+        )
+        for dx in (-1, 0, 1)
+        for dy in (-1, 0, 1)
+    }
+
+
+# Прямокутник (min_lat, max_lat, min_lng, max_lng), що містить коло радіуса;
+# min_lng > max_lng означає перетин 180-го меридіана, None — без обмеження довготи
+def bounding_box(lat: float, lng: float, radius_m: float):
+    lat_delta = radius_m / METERS_PER_DEGREE
+    min_lat = max(-90.0, lat - lat_delta)
+    max_lat = min(90.0, lat + lat_delta)
+
+    cos_lat = min(math.cos(math.radians(min_lat)), math.cos(math.radians(max_lat)))
+    if cos_lat <= 1e-9:
+        return min_lat, max_lat, None, None
+
+    lng_delta = radius_m / (METERS_PER_DEGREE * cos_lat)
+    if lng_delta >= 180.0:
+        return min_lat, max_lat, None, None
+
+    min_lng = (lng - lng_delta + 180.0) % 360.0 - 180.0
+    max_lng = (lng + lng_delta + 180.0) % 360.0 - 180.0
+    return min_lat, max_lat, min_lng, max_lng
+
+
+def haversine_m(lat: float, lng: float, lats, lngs) -> np.ndarray:
+    lat1 = math.radians(lat)
+    lat2 = np.radians(np.asarray(lats, dtype=float))
+    dlat = lat2 - lat1
+    dlng = np.radians(np.asarray(lngs, dtype=float)) - math.radians(lng)
+
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 2 * 6_371_008.8 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
@@ -0,0 +1,56 @@
+import os
+from types import SimpleNamespace
+from typing import Protocol
+
+from sqlalchemy import inspect
+
+from src.services.cache import TTLCache
+
+IDENTITY_CACHE_SIZE = int(os.getenv("IDENTITY_CACHE_SIZE", 10000))
+IDENTITY_CACHE_TTL = float(os.getenv("IDENTITY_CACHE_TTL", 60))
+
+# поля, які не потрапляють у кеш
+IDENTITY_EXCLUDED_FIELDS = {"password_hash"}
+
+
+# Інтерфейс сховища; спільний кеш (наприклад, Redis) має реалізувати ці методи
+class CacheBackend(Protocol):
+    def get(self, key: str): ...
+
+    def set(self, key: str, value: dict): ...
+
+    def delete(self, key: str): ...
+
+
+# Кеш облікових записів для get_current_user за ключем (role, id).
+# Зберігаються лише значення колонок, тож записи не прив'язані до сесії.
+class IdentityCache:
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+
+    @staticmethod
+    def key(role: str, entity_id: int) -> str:
+        return f"identity:{role}:{entity_id}"
+
+    def get(self, role: str, entity_id: int) -> SimpleNamespace | None:
+        values = self.backend.get(self.key(role, entity_id))
+        if values is None:
+            return None
+        return SimpleNamespace(**values)
+
+    def put(self, role: str, entity_id: int, entity) -> SimpleNamespace:
+        values = {
+            attr.key: getattr(entity, attr.key)
+            for attr in inspect(entity).mapper.column_attrs
+            if attr.key not in IDENTITY_EXCLUDED_FIELDS
+        }
+        self.backend.set(self.key(role, entity_id), values)
+        return SimpleNamespace(**values)
+
+    def invalidate(self, role: str, entity_id: int):
+        self.backend.delete(self.key(role, entity_id))
+
+
+identity_cache = IdentityCache(
+    TTLCache(max_size=IDENTITY_CACHE_SIZE, ttl=IDENTITY_CACHE_TTL)
+)
@@ -0,0 +1,145 @@
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+BACKGROUND_JOBS = os.getenv("BACKGROUND_JOBS", "true").lower() == "true"
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+JOB_HISTORY_SIZE = int(os.getenv("JOB_HISTORY_SIZE", 1000))
+
+
+# Фонове завдання, що виконується з заданим інтервалом у окремому потоці
+class PeriodicJob:
+    def __init__(self, name: str, interval: float, func):
+        self.name = name
+        self.interval = interval
+        self._func = func
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=self.name,
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        self._stopping.set()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self):
+        try:
+            self._func()
+        except Exception:
+            logger.exception("Periodic job %s failed", self.name)
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            self.run_once()
+
+
+periodic_jobs: list[PeriodicJob] = []
+
+
+def register_periodic_job(name: str, interval: float, func) -> PeriodicJob:
+    job = PeriodicJob(name, interval, func)
+    periodic_jobs.append(job)
+    return job
+
+
+def start_periodic_jobs():
+    if not BACKGROUND_JOBS:
+        return
+
+    for job in periodic_jobs:
+        job.start()
+
+
+def stop_periodic_jobs():
+    for job in periodic_jobs:
+        job.stop()
+
+
+# Разове фонове завдання з відстеженням прогресу
+class Job:
+    def __init__(self, kind: str):
+        self.job_id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "pending"
+        self.total = None
+        self.processed = 0
+        self.result = None
+        self.error = None
+        self.created_at = datetime.utcnow()
+        self.finished_at = None
+
+
+# Реєстр живе в пам'яті процесу: завдання видно лише на тому воркері,
+# який його запустив, на інших GET /jobs/{job_id} поверне 404
+class JobRegistry:
+    def __init__(self, max_workers: int = 2, history_size: int = 1000):
+        self.history_size = history_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="job"
+        )
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, func, *args, **kwargs) -> Job:
+        job = Job(kind)
+
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._trim()
+
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def _run(self, job: Job, func, args, kwargs):
+        job.status = "running"
+
+        try:
+            job.result = func(job, *args, **kwargs)
+            job.status = "completed"
+        except Exception as exc:
+            logger.exception("Job %s (%s) failed", job.job_id, job.kind)
+            job.status = "failed"
+            job.error = str(exc)
+        finally:
+            job.finished_at = datetime.utcnow()
+
+    def _trim(self):
+        # зберігаємо лише останні завершені завдання
+        while len(self._jobs) > self.history_size:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if oldest.finished_at is None:
+                break
+            del self._jobs[oldest_id]
+
+
+job_registry = JobRegistry(
+    max_workers=JOB_WORKERS,
+    history_size=JOB_HISTORY_SIZE
+)
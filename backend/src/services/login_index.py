@@ -0,0 +1,125 @@
+from sqlalchemy import delete, event, func, inspect, literal, select, true, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.database import SessionLocal
+from src.models.admin import Admins
+from src.models.client_companies import ClientCompanies
+from src.models.login_index import LoginIndex
+from src.models.organization import Organization
+from src.models.users import Users
+
+# порядок перевірки ролей при однаковому email (як у попередній версії login)
+LOGIN_ROLES = {
+    "user": (Users, Users.user_id),
+    "client_company": (ClientCompanies, ClientCompanies.client_id),
+    "organization": (Organization, Organization.organization_id),
+    "admin": (Admins, Admins.admin_id),
+}
+ROLE_PRIORITY = {role: index for index, role in enumerate(LOGIN_ROLES)}
+
+
+def find_login(db: Session, email: str) -> LoginIndex | None:
+    entries = db.query(LoginIndex).filter(LoginIndex.email == email).all()
+
+    if not entries:
+        return None
+
+    return min(entries, key=lambda entry: ROLE_PRIORITY[entry.role])
+
+
+def login_source(role: str):
+    model, pk = LOGIN_ROLES[role]
+    status = getattr(model, "status", None)
+
+    return select(
+        model.email,
+        literal(role),
+        pk,
+        model.password_hash,
+        func.coalesce(status, true()) if status is not None else true()
+    )
+
+
+def rebuild_login_index(job=None):
+    db = SessionLocal()
+    try:
+        db.execute(delete(LoginIndex))
+        db.execute(
+            insert(LoginIndex)
+            .from_select(
+                ["email", "role", "account_id", "password_hash", "status"],
+                union_all(*(login_source(role) for role in LOGIN_ROLES))
+            )
+            .on_conflict_do_nothing()
+        )
+        db.commit()
+
+        return {"entries": db.query(LoginIndex).count()}
+    finally:
+        db.close()
+
+
+def ensure_login_index(job=None):
+    db = SessionLocal()
+    try:
+        empty = db.query(LoginIndex.email).first() is None
+    finally:
+        db.close()
+
+    if empty:
+        rebuild_login_index()
+
+
+def _upsert(connection, role: str, target):
+    model, pk = LOGIN_ROLES[role]
+
+    stmt = insert(LoginIndex).values(
+        email=target.email,
+        role=role,
+        account_id=getattr(target, pk.key),
+        password_hash=target.password_hash,
+        status=getattr(target, "status", True) is not False
+    )
+    connection.execute(stmt.on_conflict_do_update(
+        index_elements=["email", "role"],
+        set_={
+            "account_id": stmt.excluded.account_id,
+            "password_hash": stmt.excluded.password_hash,
+            "status": stmt.excluded.status,
+        }
+    ))
+
+
+def _delete(connection, role: str, email: str):
+    connection.execute(
+        delete(LoginIndex).where(
+            LoginIndex.email == email,
+            LoginIndex.role == role
+        )
+    )
+
+
+# Індекс підтримується подіями ORM для всіх чотирьох моделей
+def _register(role: str, model):
+    @event.listens_for(model, "after_insert")
+    def after_insert(mapper, connection, target):
+        _upsert(connection, role, target)
+
+    @event.listens_for(model, "after_update")
+    def after_update(mapper, connection, target):
+        history = inspect(target).attrs.email.history
+
+        for old_email in history.deleted or ():
+            if old_email and old_email != target.email:
+                _delete(connection, role, old_email)
+
+        _upsert(connection, role, target)
+
+    @event.listens_for(model, "after_delete")
+    def after_delete(mapper, connection, target):
+        _delete(connection, role, target.email)
+
+
+for _role, (_model, _pk) in LOGIN_ROLES.items():
+    _register(_role, _model)
@@ -0,0 +1,72 @@
+from sqlalchemy.orm import Session
+
+from src.models.notifications import Notifications, NotificationCursors
+
+
+# Одне сповіщення на подію в місті замість копії для кожного мешканця
+def broadcast_city_notification(
+    db: Session,
+    city: str,
+    container_site_id: int,
+    message_type: str,
+    message: str
+):
+    db.add(Notifications(
+        city=city,
+        container_site_id=container_site_id,
+        message_type=message_type,
+        message=message
+    ))
+
+
+def user_notifications_query(
+    db: Session,
+    user,
+    message_type: str | None = None,
+    since=None
+):
+    filters = []
+    if message_type:
+        filters.append(Notifications.message_type == message_type)
+    if since is not None:
+        filters.append(Notifications.created_at > since)
+
+    # дві частини об'єднуються окремо, щоб кожна йшла своїм індексом
+    personal = db.query(Notifications).filter(
+        Notifications.user_id == user.user_id,
+        *filters
+    )
+
+    # без міста користувач отримує лише особисті сповіщення; інакше
+    # city IS NULL зачепив би чужі сповіщення без міста (телеметрію)
+    if not user.city:
+        return personal
+
+    broadcasts = db.query(Notifications).filter(
+        Notifications.user_id.is_(None),
+        Notifications.city.is_not(None),
+        Notifications.city == user.city,
+        *filters
+    )
+
+    return personal.union_all(broadcasts)
+
+
+def mark_notifications_read(db: Session, user, read_at):
+    cursor = db.get(NotificationCursors, user.user_id)
+
+    if cursor is None:
+        cursor = NotificationCursors(user_id=user.user_id, last_read_at=read_at)
+        db.add(cursor)
+    elif read_at > cursor.last_read_at:
+        cursor.last_read_at = read_at
+
+    db.commit()
+    return cursor
+
+
+def unread_notifications_count(db: Session, user) -> int:
+    cursor = db.get(NotificationCursors, user.user_id)
+    since = cursor.last_read_at if cursor is not None else None
+
+    return user_notifications_query(db, user, since=since).count()
@@ -0,0 +1,294 @@
+import os
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import event, func, inspect, literal, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.database import SessionLocal
+from src.models.analytics import OrganizationStats
+from src.models.container_sites import ContainerSite
+from src.models.containers import Containers
+from src.models.disposal_requests import DisposalRequests
+from src.models.organization import Organization
+from src.services.jobs import register_periodic_job
+
+ORGANIZATION_STATS_INTERVAL = float(os.getenv("ORGANIZATION_STATS_INTERVAL", 86400))
+
+STATS_COLUMNS = [
+    "organization_id",
+    "total_requests",
+    "completed_requests",
+    "container_sites",
+    "containers",
+    "last_activity",
+    "refreshed_at",
+]
+
+COUNTERS = [
+    "total_requests",
+    "completed_requests",
+    "container_sites",
+    "containers",
+]
+
+
+def _scalar(statement):
+    return statement.scalar_subquery()
+
+
+# Кожен показник рахується окремим корельованим підзапитом,
+# тож рядки заявок, майданчиків і контейнерів не перемножуються
+def organization_stats_source(organization_ids=None):
+    org_id = Organization.organization_id
+
+    requests = select(func.count()).where(
+        DisposalRequests.organization_id == org_id
+    )
+
+    statement = select(
+        org_id,
+        _scalar(requests),
+        _scalar(requests.where(DisposalRequests.status == "completed")),
+        _scalar(select(func.count()).where(
+            ContainerSite.organization_id == org_id
+        )),
+        _scalar(
+            select(func.count())
+            .select_from(Containers)
+            .join(ContainerSite)
+            .where(ContainerSite.organization_id == org_id)
+        ),
+        _scalar(select(func.max(DisposalRequests.updated_at)).where(
+            DisposalRequests.organization_id == org_id
+        )),
+        literal(datetime.utcnow())
+    )
+
+    if organization_ids is not None:
+        statement = statement.where(org_id.in_(organization_ids))
+
+    return statement
+
+
+def refresh_organization_stats(connection, organization_ids=None):
+    if organization_ids is not None and not organization_ids:
+        return 0
+
+    stmt = insert(OrganizationStats).from_select(
+        STATS_COLUMNS,
+        organization_stats_source(organization_ids)
+    )
+
+    return connection.execute(stmt.on_conflict_do_update(
+        index_elements=["organization_id"],
+        set_={
+            column: stmt.excluded[column]
+            for column in STATS_COLUMNS[1:]
+        }
+    )).rowcount
+
+
+# Повний перерахунок виправляє розбіжності інкрементних лічильників
+def reconcile_organization_stats(job=None):
+    db = SessionLocal()
+    try:
+        # блокує інкременти на час перерахунку, щоб вони не загубилися
+        db.execute(text(
+            "LOCK TABLE organization_stats IN SHARE ROW EXCLUSIVE MODE"
+        ))
+        refreshed = refresh_organization_stats(db.connection())
+        db.commit()
+
+        return {"organizations": refreshed}
+    finally:
+        db.close()
+
+
+# Зсуває лічильники організації в поточній транзакції
+def adjust_organization_stats(connection, organization_id: int, deltas: dict):
+    activity = deltas.pop("last_activity", None)
+
+    stmt = insert(OrganizationStats).values(
+        organization_id=organization_id,
+        last_activity=activity,
+        refreshed_at=datetime.utcnow(),
+        **{counter: max(deltas.get(counter, 0), 0) for counter in COUNTERS}
+    )
+
+    table = OrganizationStats.__table__.c
+    set_ = {
+        counter: table[counter] + deltas[counter]
+        for counter in COUNTERS
+        if deltas.get(counter)
+    }
+    if activity is not None:
+        set_["last_activity"] = func.greatest(
+            table.last_activity, stmt.excluded.last_activity
+        )
+
+    if set_:
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=["organization_id"],
+            set_=set_
+        ))
+
+
+def _old(target, attribute: str):
+    history = inspect(target).attrs[attribute].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.added:
+        return None
+    return getattr(target, attribute)
+
+
+def is_completed(status: str | None) -> int:
+    return int(status == "completed")
+
+
+class _Deltas:
+    def __init__(self):
+        self.by_organization = defaultdict(lambda: defaultdict(int))
+
+    def add(self, organization_id, counter: str, value: int):
+        if organization_id is not None and value:
+            self.by_organization[organization_id][counter] += value
+
+    def activity(self, organization_id, moment):
+        if organization_id is None or moment is None:
+            return
+
+        deltas = self.by_organization[organization_id]
+        current = deltas.get("last_activity")
+        deltas["last_activity"] = moment if current is None else max(current, moment)
+
+
+def _request_deltas(deltas: _Deltas, target, state: str):
+    if state != "new":
+        deltas.add(_old(target, "organization_id"), "total_requests", -1)
+        deltas.add(
+            _old(target, "organization_id"),
+            "completed_requests",
+            -is_completed(_old(target, "status"))
+        )
+
+    if state != "deleted":
+        deltas.add(target.organization_id, "total_requests", 1)
+        deltas.add(
+            target.organization_id,
+            "completed_requests",
+            is_completed(target.status)
+        )
+        deltas.activity(target.organization_id, target.updated_at)
+
+
+# атрибути, за якими рахуються зсуви; їх старі значення мають бути відомі
+TRACKED_ATTRIBUTES = {
+    DisposalRequests: ("organization_id", "status", "updated_at"),
+    ContainerSite: ("organization_id",),
+    Containers: ("container_site_id",),
+}
+
+
+def _track_old_values(model, attribute: str):
+    # active_history завантажує попереднє значення перед присвоєнням
+    @event.listens_for(getattr(model, attribute), "set", active_history=True)
+    def _set(target, value, oldvalue, initiator):
+        pass
+
+
+for _model, _attributes in TRACKED_ATTRIBUTES.items():
+    for _attribute in _attributes:
+        _track_old_values(_model, _attribute)
+
+
+@event.listens_for(Session, "before_flush")
+def _load_deleted(session, flush_context, instances):
+    # після DELETE прострочені атрибути вже не завантажити
+    for target in session.deleted:
+        for attribute in TRACKED_ATTRIBUTES.get(type(target), ()):
+            getattr(target, attribute)
+
+
+# Зміни заявок, майданчиків і контейнерів після кожного flush
+# перетворюються на зсуви лічильників без повного перерахунку
+@event.listens_for(Session, "after_flush")
+def _adjust_touched_organizations(session, flush_context):
+    deltas = _Deltas()
+    sites = {}
+    containers = []
+
+    for state, targets in (
+        ("new", session.new),
+        ("dirty", session.dirty),
+        ("deleted", session.deleted),
+    ):
+        for target in targets:
+            if isinstance(target, DisposalRequests):
+                _request_deltas(deltas, target, state)
+
+            elif isinstance(target, ContainerSite):
+                site_id = target.container_site_id
+                old_org = _old(target, "organization_id")
+                new_org = None if state == "deleted" else target.organization_id
+                sites[site_id] = old_org if state == "deleted" else new_org
+
+                if state == "new":
+                    old_org = None
+                if old_org != new_org:
+                    deltas.add(old_org, "container_sites", -1)
+                    deltas.add(new_org, "container_sites", 1)
+
+                    # контейнери переїжджають разом із майданчиком
+                    if state == "dirty":
+                        moved = session.connection().execute(
+                            select(func.count())
+                            .select_from(Containers)
+                            .where(Containers.container_site_id == site_id)
+                        ).scalar()
+                        deltas.add(old_org, "containers", -moved)
+                        deltas.add(new_org, "containers", moved)
+
+            elif isinstance(target, Containers):
+                old_site = None if state == "new" else _old(target, "container_site_id")
+                new_site = None if state == "deleted" else target.container_site_id
+                if old_site != new_site:
+                    containers.append((old_site, new_site))
+
+    if containers:
+        # майданчики з цього ж flush уже можуть бути видалені з бази
+        unknown = {
+            site_id
+            for pair in containers for site_id in pair
+            if site_id is not None and site_id not in sites
+        }
+        if unknown:
+            sites.update(session.connection().execute(
+                select(ContainerSite.container_site_id, ContainerSite.organization_id)
+                .where(ContainerSite.container_site_id.in_(unknown))
+            ).all())
+
+        for old_site, new_site in containers:
+            deltas.add(sites.get(old_site), "containers", -1)
+            deltas.add(sites.get(new_site), "containers", 1)
+
+    if not deltas.by_organization:
+        return
+
+    connection = session.connection()
+
+    for organization_id in sorted(deltas.by_organization):
+        adjust_organization_stats(
+            connection,
+            organization_id,
+            dict(deltas.by_organization[organization_id])
+        )
+
+
+organization_stats_job = register_periodic_job(
+    "organization-stats-reconcile",
+    ORGANIZATION_STATS_INTERVAL,
+    reconcile_organization_stats
+)
@@ -0,0 +1,185 @@
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
+from src.services.cache import TTLCache
+
+# 0 робочих процесів означає рендеринг в окремому потоці (без process pool)
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", os.cpu_count() or 1))
+PDF_CACHE_SIZE = int(os.getenv("PDF_CACHE_SIZE", 2000))
+PDF_CACHE_TTL = float(os.getenv("PDF_CACHE_TTL", 86400))
+# стандартний Helvetica не містить кирилиці, тому потрібен TTF-шрифт
+PDF_FONT_PATH = os.getenv(
+    "PDF_FONT_PATH", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf")
+
+FONT_NAME = "ActFont"
+
+_font = None
+
+
+def _font_name() -> str:
+    global _font
+
+    if _font is None:
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+
+        if PDF_FONT_PATH and os.path.exists(PDF_FONT_PATH):
+            pdfmetrics.registerFont(TTFont(FONT_NAME, PDF_FONT_PATH))
+            _font = FONT_NAME
+        else:
+            _font = "Helvetica"
+
+    return _font
+
+
+# Виконується у робочому процесі, тому приймає та повертає лише прості типи
+def render_act(act: dict) -> bytes:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.lib.utils import simpleSplit
+    from reportlab.pdfgen import canvas
+
+    font = _font_name()
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4, invariant=1)
+    width, height = A4
+    left = 20 * mm
+    line_width = width - 2 * left
+    y = height - 25 * mm
+
+    def line(text: str, size: int = 11, gap: float = 6 * mm):
+        nonlocal y
+        for part in simpleSplit(text, font, size, line_width) or [""]:
+            pdf.setFont(font, size)
+            pdf.drawString(left, y, part)
+            y -= gap
+
+    number = act.get("request_id") or ""
+    line(f"АКТ приймання-передачі відходів № {number}", size=14, gap=10 * mm)
+    line(f"м. {act['city']}    {act['act_date']}", gap=10 * mm)
+
+    line("Передавач:", size=12)
+    line(act["sender_name"])
+    line(f"ЄДРПОУ: {act['sender_edrpou']}")
+    line(f"Адреса: {act['sender_address']}")
+    line(f"Телефон: {act['sender_phone']}", gap=10 * mm)
+
+    line("Отримувач:", size=12)
+    line(act["receiver_name"])
+    line(f"ЄДРПОУ: {act['receiver_edrpou']}")
+    line(f"Адреса: {act['receiver_address']}")
+    line(f"Телефон: {act['receiver_phone']}", gap=10 * mm)
+
+    transferred = act["transfer_datetime"][:16].replace("T", " ")
+    line(f"Дата та час передачі: {transferred}")
+    line(f"Опис відходів: {act['waste_description']}", gap=20 * mm)
+
+    line("Передав: ____________________        Прийняв: ____________________")
+
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def act_digest(act: dict) -> str:
+    raw = repr(sorted(act.items())).encode()
+    return hashlib.sha256(raw).hexdigest()
+
+
+# Потік для zipfile без seek: записані байти забираються порціями,
+# тому архів віддається клієнту поступово
+class ZipChunks(io.RawIOBase):
+    def __init__(self):
+        self._buffer = bytearray()
+        self._written = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._buffer += data
+        self._written += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._written
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+class PdfRenderer:
+    def __init__(self, workers: int, cache: TTLCache):
+        self.workers = workers
+        self.cache = cache
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                if self.workers > 0:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=1,
+                        thread_name_prefix="pdf"
+                    )
+            return self._executor
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def render_batch(self, acts: list[dict]) -> list[bytes]:
+        digests = [act_digest(act) for act in acts]
+        documents = [self.cache.get(digest) for digest in digests]
+
+        missing = [i for i, document in enumerate(documents) if document is None]
+        if missing:
+            rendered = self.executor().map(
+                render_act,
+                [acts[i] for i in missing],
+                chunksize=max(1, len(missing) // (max(self.workers, 1) * 4))
+            )
+
+            for i, document in zip(missing, rendered):
+                documents[i] = document
+                self.cache.set(digests[i], document)
+
+        return documents
+
+    # Пакети рендеряться паралельно, а кожен готовий PDF одразу
+    # дописується в архів і відправляється
+    def zip_stream(self, acts, filename, batch_size: int | None = None):
+        batch_size = batch_size or max(self.workers, 1) * 8
+        acts = iter(acts)
+        output = ZipChunks()
+
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as archive:
+            while batch := list(islice(acts, batch_size)):
+                for act, document in zip(batch, self.render_batch(batch)):
+                    archive.writestr(filename(act), document)
+                    yield output.drain()
+
+        yield output.drain()
+
+
+pdf_renderer = PdfRenderer(
+    PDF_RENDER_WORKERS,
+    TTLCache(max_size=PDF_CACHE_SIZE, ttl=PDF_CACHE_TTL)
+)
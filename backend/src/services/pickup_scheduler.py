@@ -0,0 +1,252 @@
+import logging
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import Date, cast, exists, func, insert as bulk_insert, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.database import SessionLocal
+from src.models.container_sites import ContainerSite
+from src.models.containers import Containers
+from src.models.organization import Organization
+from src.models.pickups import Pickups, SiteFillProjections
+from src.models.vehicles import Vehicles
+from src.services.forecast import forecast_containers
+from src.services.jobs import register_periodic_job
+from src.services.notifications import broadcast_city_notification
+
+logger = logging.getLogger(__name__)
+
+PICKUP_HORIZON_HOURS = float(os.getenv("PICKUP_HORIZON_HOURS", 24))
+PICKUP_DEFAULT_VEHICLE_CAPACITY = int(os.getenv("PICKUP_DEFAULT_VEHICLE_CAPACITY", 20))
+PICKUP_SCHEDULER_INTERVAL = float(os.getenv("PICKUP_SCHEDULER_INTERVAL", 900))
+
+# ключ advisory lock, щоб планувальник запускав лише один воркер
+SCHEDULER_LOCK_KEY = 7302
+
+
+# Блокування до кінця транзакції: ручний запуск і періодичне завдання
+# не створюють вивози для тих самих майданчиків одночасно
+def try_scheduler_lock(db: Session) -> bool:
+    return db.execute(
+        select(func.pg_try_advisory_xact_lock(SCHEDULER_LOCK_KEY))
+    ).scalar()
+
+
+# Переоцінюються лише майданчики без відкритого вивозу, у яких змінилися
+# показання контейнерів, ще немає прогнозу або прогноз потрапляє в горизонт
+def candidate_sites(db: Session, organization_id: int, horizon_end: datetime):
+    site_id = ContainerSite.container_site_id
+
+    open_pickup = exists().where(
+        Pickups.container_site_id == site_id,
+        Pickups.completed_time.is_(None)
+    )
+    changed = exists().where(
+        Containers.container_site_id == site_id,
+        Containers.last_update > SiteFillProjections.evaluated_at
+    )
+
+    return db.execute(
+        select(
+            site_id,
+            ContainerSite.city,
+            ContainerSite.street,
+            ContainerSite.building
+        )
+        .outerjoin(SiteFillProjections)
+        .where(
+            ContainerSite.organization_id == organization_id,
+            ~open_pickup,
+            or_(
+                SiteFillProjections.container_site_id.is_(None),
+                SiteFillProjections.due_at <= horizon_end,
+                changed
+            )
+        )
+    ).all()
+
+
+def project_sites(db: Session, organization_id: int, site_ids: list[int], now: datetime) -> dict:
+    containers = db.execute(
+        select(
+            Containers.container_id,
+            Containers.container_site_id,
+            Containers.fill_level,
+            Containers.last_update
+        )
+        .where(Containers.container_site_id.in_(site_ids))
+    ).all()
+
+    forecasts = forecast_containers(db, containers, now)
+
+    due = dict.fromkeys(site_ids)
+    for container, forecast in zip(containers, forecasts):
+        due_at = forecast["full_at"] and max(now, forecast["full_at"])
+        site_due = due[container.container_site_id]
+
+        if due_at is not None and (site_due is None or due_at < site_due):
+            due[container.container_site_id] = due_at
+
+    if due:
+        stmt = insert(SiteFillProjections).values([
+            {
+                "container_site_id": site_id,
+                "organization_id": organization_id,
+                "due_at": due_at,
+                "evaluated_at": now,
+            }
+            for site_id, due_at in due.items()
+        ])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["container_site_id"],
+            set_={
+                "organization_id": stmt.excluded.organization_id,
+                "due_at": stmt.excluded.due_at,
+                "evaluated_at": stmt.excluded.evaluated_at,
+            }
+        ))
+
+    return due
+
+
+def vehicle_loads(db: Session, vehicle_ids: list[int], now: datetime, horizon_end: datetime) -> dict:
+    day = cast(Pickups.scheduled_time, Date)
+
+    rows = db.execute(
+        select(Pickups.vehicle_id, day, func.count())
+        .where(
+            Pickups.vehicle_id.in_(vehicle_ids),
+            Pickups.completed_time.is_(None),
+            Pickups.scheduled_time >= datetime.combine(now.date(), datetime.min.time()),
+            Pickups.scheduled_time <= horizon_end
+        )
+        .group_by(Pickups.vehicle_id, day)
+    )
+
+    return {
+        (vehicle_id, scheduled_day): count
+        for vehicle_id, scheduled_day, count in rows
+    }
+
+
+def schedule_organization(
+    db: Session,
+    organization_id: int,
+    now: datetime | None = None,
+    dry_run: bool = False
+) -> dict:
+    now = now or datetime.utcnow()
+    horizon_end = now + timedelta(hours=PICKUP_HORIZON_HOURS)
+
+    sites = {
+        site.container_site_id: site
+        for site in candidate_sites(db, organization_id, horizon_end)
+    }
+    due = project_sites(db, organization_id, list(sites), now) if sites else {}
+
+    vehicles = db.execute(
+        select(Vehicles.vehicle_id, Vehicles.daily_capacity)
+        .where(Vehicles.organization_id == organization_id)
+        .order_by(Vehicles.vehicle_id)
+    ).all()
+    capacity = {
+        vehicle.vehicle_id:
+        vehicle.daily_capacity or PICKUP_DEFAULT_VEHICLE_CAPACITY
+        for vehicle in vehicles
+    }
+    loads = vehicle_loads(db, list(capacity), now, horizon_end) if capacity else {}
+
+    proposals = []
+    unassigned = []
+
+    for site_id, due_at in sorted(
+        ((site_id, due_at) for site_id, due_at in due.items()
+         if due_at is not None and due_at <= horizon_end),
+        key=lambda item: item[1]
+    ):
+        day = due_at.date()
+
+        # машина з найбільшим залишком місткості на цей день
+        vehicle_id = max(
+            capacity,
+            key=lambda v: capacity[v] - loads.get((v, day), 0),
+            default=None
+        )
+
+        if vehicle_id is None or capacity[vehicle_id] <= loads.get((vehicle_id, day), 0):
+            unassigned.append(site_id)
+            continue
+
+        loads[vehicle_id, day] = loads.get((vehicle_id, day), 0) + 1
+        proposals.append({
+            "container_site_id": site_id,
+            "vehicle_id": vehicle_id,
+            "scheduled_time": due_at,
+            "due_at": due_at,
+        })
+
+    if dry_run:
+        db.rollback()
+    elif proposals:
+        db.execute(bulk_insert(Pickups), [
+            {
+                "container_site_id": proposal["container_site_id"],
+                "vehicle_id": proposal["vehicle_id"],
+                "scheduled_time": proposal["scheduled_time"],
+            }
+            for proposal in proposals
+        ])
+
+        for proposal in proposals:
+            site = sites[proposal["container_site_id"]]
+            if site.city:
+                broadcast_city_notification(
+                    db,
+                    site.city,
+                    site.container_site_id,
+                    "waste_collection",
+                    (
+                        f"Заплановано вивіз сміття за адресою "
+                        f"{site.street} {site.building}"
+                    )
+                )
+
+    return {
+        "organization_id": organization_id,
+        "evaluated_sites": len(sites),
+        "created": 0 if dry_run else len(proposals),
+        "proposals": proposals,
+        "unassigned_site_ids": unassigned,
+    }
+
+
+def run_pickup_scheduler(now: datetime | None = None):
+    db = SessionLocal()
+
+    try:
+        if not try_scheduler_lock(db):
+            return
+
+        organization_ids = db.execute(
+            select(Organization.organization_id)
+        ).scalars().all()
+
+        created = 0
+        for organization_id in organization_ids:
+            created += schedule_organization(db, organization_id, now)["created"]
+
+        db.commit()
+
+        if created:
+            logger.info("Pickup scheduler created %s pickups", created)
+    finally:
+        db.close()
+
+
+pickup_scheduler_job = register_periodic_job(
+    "pickup-scheduler",
+    PICKUP_SCHEDULER_INTERVAL,
+    run_pickup_scheduler
+)
@@ -0,0 +1,140 @@
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+# заголовки X-DB-* у відповідях (лише для налагодження)
+QUERY_DEBUG_HEADERS = os.getenv("QUERY_DEBUG_HEADERS", "false").lower() == "true"
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", 1000))
+# однаковий запит, виконаний стільки разів за запит, вважається N+1
+QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", 5))
+QUERY_BREAKDOWN_SIZE = int(os.getenv("QUERY_BREAKDOWN_SIZE", 10))
+
+
+# Запити до бази в межах одного HTTP-запиту, згруповані за текстом SQL
+class RequestQueries:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = defaultdict(lambda: [0, 0.0])
+        self._lock = threading.Lock()
+
+    def add(self, statement: str, seconds: float):
+        with self._lock:
+            self.count += 1
+            self.seconds += seconds
+            entry = self.statements[statement]
+            entry[0] += 1
+            entry[1] += seconds
+
+    def repeated(self) -> dict:
+        with self._lock:
+            return {
+                statement: entry[0]
+                for statement, entry in self.statements.items()
+                if entry[0] >= QUERY_REPEAT_THRESHOLD
+            }
+
+    def breakdown(self) -> str:
+        with self._lock:
+            top = sorted(
+                self.statements.items(),
+                key=lambda item: item[1][1],
+                reverse=True
+            )[:QUERY_BREAKDOWN_SIZE]
+
+        return "\n".join(
+            f"  {count}x {seconds * 1000:.1f} ms  {' '.join(statement.split())[:300]}"
+            for statement, (count, seconds) in top
+        )
+
+
+current_queries: ContextVar[RequestQueries | None] = ContextVar(
+    "current_queries", default=None
+)
+
+
+# Слухачі на класі Engine охоплюють основну базу, async-двигун і репліки
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = conn.info["query_started_at"].pop()
+    queries = current_queries.get()
+
+    if queries is not None:
+        queries.add(statement, time.perf_counter() - started_at)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    connection = context.connection
+    if connection is not None and connection.info.get("query_started_at"):
+        connection.info["query_started_at"].pop()
+
+
+def report(scope, queries: RequestQueries, elapsed_ms: float):
+    repeated = queries.repeated()
+    path = f"{scope['method']} {scope['path']}"
+
+    if repeated:
+        logger.warning(
+            "Repeated queries in %s (possible N+1):\n%s",
+            path,
+            "\n".join(
+                f"  {count}x {' '.join(statement.split())[:300]}"
+                for statement, count in repeated.items()
+            )
+        )
+
+    if elapsed_ms >= SLOW_REQUEST_MS:
+        logger.warning(
+            "Slow request %s: %.0f ms, %s queries, %.0f ms in database\n%s",
+            path,
+            elapsed_ms,
+            queries.count,
+            queries.seconds * 1000,
+            queries.breakdown()
+        )
+
+
+# ASGI-middleware, а не BaseHTTPMiddleware: потокові відповіді
+# враховуються повністю, а контекст доходить до ендпоінтів у threadpool
+class QueryStatsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries()
+        token = current_queries.set(queries)
+        started_at = time.perf_counter()
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and QUERY_DEBUG_HEADERS:
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Query-Count"] = str(queries.count)
+                headers["X-DB-Time-Ms"] = f"{queries.seconds * 1000:.1f}"
+                headers["X-DB-Repeated-Queries"] = str(len(queries.repeated()))
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            current_queries.reset(token)
+            report(scope, queries, (time.perf_counter() - started_at) * 1000)
@@ -0,0 +1,188 @@
+import os
+import time
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+ROUTE_MAX_MOVES = 5000
+# час (с) на покращення одного маршруту; після нього лишається найкращий знайдений
+ROUTE_TIME_BUDGET = float(os.getenv("ROUTE_TIME_BUDGET", 0.3))
+OR_OPT_SEGMENTS = (1, 2, 3)
+EPSILON = 1e-9
+
+
+def haversine_matrix(lat, lng) -> np.ndarray:
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lng = np.radians(np.asarray(lng, dtype=float))
+
+    dlat = lat[:, None] - lat[None, :]
+    dlng = lng[:, None] - lng[None, :]
+
+    a = (
+        np.sin(dlat / 2) ** 2
+        + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlng / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def nearest_neighbour(dist: np.ndarray, start: int = 0) -> list[int]:
+    n = len(dist)
+    visited = np.zeros(n, dtype=bool)
+    route = [start]
+    visited[start] = True
+
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, dist[route[-1]])
+        nxt = int(np.argmin(row))
+        route.append(nxt)
+        visited[nxt] = True
+
+    return route
+
+
+# Маршрут відкритий (без повернення), тому в кінець додається фіктивна
+# вершина з нульовими відстанями, а перша зупинка ніколи не переміщується
+def _with_dummy(dist: np.ndarray) -> np.ndarray:
+    n = len(dist)
+    extended = np.zeros((n + 1, n + 1))
+    extended[:n, :n] = dist
+    return extended
+
+
+def _two_opt_moves(route: np.ndarray, dist: np.ndarray):
+    # хід (i, j) розвертає позиції i+1..j: ребра (i, i+1) та (j, j+1)
+    # замінюються на (i, j) та (i+1, j+1)
+    a = route[:-1]
+    b = route[1:]
+    edges = dist[a, b]
+
+    delta = (
+        dist[a[:, None], a[None, :]]
+        + dist[b[:, None], b[None, :]]
+        - edges[:, None]
+        - edges[None, :]
+    )
+    delta[np.tril_indices(len(a))] = np.inf
+
+    # ходи, що не перетинаються, не впливають один на одного,
+    # тож з однієї матриці застосовується одразу кілька найкращих
+    best_j = np.argmin(delta, axis=1)
+    gains = delta[np.arange(len(a)), best_j]
+
+    moves = []
+    taken = np.zeros(len(route), dtype=bool)
+
+    for i in np.argsort(gains):
+        if gains[i] >= -EPSILON:
+            break
+
+        j = best_j[i]
+        if taken[i:j + 2].any():
+            continue
+
+        taken[i:j + 2] = True
+        moves.append((i, j))
+
+    return moves
+
+
+def _best_or_opt(route: np.ndarray, dist: np.ndarray, length: int):
+    # сегмент позицій s..s+L-1 переноситься на ребро (k, k+1),
+    # можливо у зворотному порядку
+    n = len(route) - 1
+    starts = np.arange(1, n - length + 1)
+    if len(starts) == 0:
+        return np.inf, 0, 0, False
+
+    first = route[starts]
+    last = route[starts + length - 1]
+    prev = route[starts - 1]
+    nxt = route[starts + length]
+    removed = dist[prev, first] + dist[last, nxt] - dist[prev, nxt]
+
+    x = route[:-1]
+    y = route[1:]
+    base = dist[x, y]
+
+    forward = dist[x[None, :], first[:, None]] + dist[last[:, None], y[None, :]]
+    backward = dist[x[None, :], last[:, None]] + dist[first[:, None], y[None, :]]
+    reverse = backward < forward
+
+    delta = np.minimum(forward, backward) - base[None, :] - removed[:, None]
+
+    edges = np.arange(n)
+    touching = (
+        (edges[None, :] >= starts[:, None] - 1)
+        & (edges[None, :] <= starts[:, None] + length - 1)
+    )
+    delta[touching] = np.inf
+
+    s, k = np.unravel_index(np.argmin(delta), delta.shape)
+    return delta[s, k], int(starts[s]), int(k), bool(reverse[s, k])
+
+
+def _apply_or_opt(route: np.ndarray, start: int, length: int, edge: int, reverse: bool):
+    segment = route[start:start + length]
+    if reverse:
+        segment = segment[::-1]
+
+    rest = np.concatenate([route[:start], route[start + length:]])
+    position = edge + 1 if edge < start else edge + 1 - length
+    return np.concatenate([rest[:position], segment, rest[position:]])
+
+
+def improve_route(
+    route: list[int],
+    dist: np.ndarray,
+    deadline: float | None = None
+) -> list[int]:
+    if len(route) < 3:
+        return route
+
+    dummy = len(dist)
+    dist = _with_dummy(dist)
+    current = np.array(route + [dummy])
+
+    for _ in range(ROUTE_MAX_MOVES):
+        # кожен крок лише скорочує маршрут, тож його можна перервати будь-коли
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+
+        moves = _two_opt_moves(current, dist)
+        if moves:
+            for i, j in moves:
+                current[i + 1:j + 1] = current[i + 1:j + 1][::-1]
+            continue
+
+        best = min(
+            (_best_or_opt(current, dist, length) + (length,)
+             for length in OR_OPT_SEGMENTS),
+            key=lambda move: move[0]
+        )
+        gain, start, edge, reverse, length = best
+        if gain < -EPSILON:
+            current = _apply_or_opt(current, start, length, edge, reverse)
+            continue
+
+        break
+
+    return [int(node) for node in current[:-1]]
+
+
+def route_length(route: list[int], dist: np.ndarray) -> float:
+    if len(route) < 2:
+        return 0.0
+    return float(dist[route[:-1], route[1:]].sum())
+
+
+# Порядок об'їзду: найближчий сусід від першої зупинки, потім 2-opt та Or-opt
+def plan_route(
+    lat,
+    lng,
+    start: int = 0,
+    budget: float = ROUTE_TIME_BUDGET
+) -> tuple[list[int], np.ndarray]:
+    deadline = time.monotonic() + budget
+    dist = haversine_matrix(lat, lng)
+    route = nearest_neighbour(dist, start)
+    return improve_route(route, dist, deadline), dist
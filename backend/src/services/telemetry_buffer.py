@@ -0,0 +1,101 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+# Обмежений буфер телеметрії з фоновим записом у БД.
+# Для кожного serial_number зберігається лише останнє показання,
+# тому розмір буфера не перевищує кількості активних пристроїв.
+class TelemetryBuffer:
+
+    def __init__(
+        self,
+        flush,
+        max_size: int = 10000,
+        flush_interval: float = 1.0,
+        flush_size: int = 500
+    ):
+        self._flush = flush
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pending)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def put(self, reading) -> bool:
+        with self._lock:
+            if (
+                reading.serial_number not in self._pending
+                and len(self._pending) >= self.max_size
+            ):
+                return False
+
+            self._pending[reading.serial_number] = reading
+            size = len(self._pending)
+
+        if size >= self.flush_size:
+            self._wakeup.set()
+
+        return True
+
+    def start(self):
+        if self.running:
+            return
+
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="telemetry-flusher",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        self._stopping.set()
+        self._wakeup.set()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+        # дописуємо все, що залишилось після зупинки потоку
+        self.flush()
+
+    def flush(self) -> int:
+        with self._lock:
+            if not self._pending:
+                return 0
+            batch = list(self._pending.values())
+            self._pending = {}
+
+        try:
+            self._flush(batch)
+        except Exception:
+            logger.exception("Failed to flush %d telemetry readings", len(batch))
+
+            # повертаємо показання, якщо новіші ще не надійшли
+            with self._lock:
+                for reading in batch:
+                    self._pending.setdefault(reading.serial_number, reading)
+            return 0
+
+        return len(batch)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
@@ -0,0 +1,347 @@
+import logging
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, func, literal_column, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.database import SessionLocal
+from src.models.telemetry import TelemetryHistory, TelemetryRollups
+from src.services.jobs import register_periodic_job
+
+logger = logging.getLogger(__name__)
+
+TELEMETRY_RAW_RETENTION_DAYS = int(os.getenv("TELEMETRY_RAW_RETENTION_DAYS", 14))
+TELEMETRY_5M_RETENTION_DAYS = int(os.getenv("TELEMETRY_5M_RETENTION_DAYS", 90))
+TELEMETRY_ROLLUP_INTERVAL = float(os.getenv("TELEMETRY_ROLLUP_INTERVAL", 300))
+
+BUCKET_5M = 300
+BUCKET_1H = 3600
+BUCKET_ORIGIN = datetime(2000, 1, 1)
+
+PARTITION_PREFIX = "telemetry_history_"
+PARTITIONS_AHEAD = 2
+
+# ключ advisory lock, щоб обслуговування виконував лише один воркер
+MAINTENANCE_LOCK_KEY = 7301
+
+
+def date_bin(seconds: int, column):
+    # константи вбудовуються в SQL, щоб вираз у GROUP BY збігався з SELECT
+    return func.date_bin(
+        literal_column(f"interval '{seconds} seconds'"),
+        column,
+        literal_column(f"timestamp '{BUCKET_ORIGIN:%Y-%m-%d}'")
+    )
+
+
+def record_telemetry(db: Session, rows: list[dict]):
+    if not rows:
+        return
+
+    db.execute(
+        insert(TelemetryHistory).on_conflict_do_nothing(),
+        rows
+    )
+
+
+def partition_name(day: datetime) -> str:
+    return f"{PARTITION_PREFIX}{day:%Y%m%d}"
+
+
+def partition_exists(db: Session, name: str) -> bool:
+    return db.execute(
+        select(func.to_regclass(name).is_not(None))
+    ).scalar()
+
+
+# Показання за день без секції лежать у DEFAULT, і CREATE ... PARTITION OF
+# для такого дня не пройде, тому рядки спершу переносяться в нову таблицю
+def create_partition(db: Session, start: datetime):
+    name = partition_name(start)
+    end = start + timedelta(days=1)
+    bounds = f"FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+    in_range = (
+        f"recorded_at >= '{start:%Y-%m-%d}' AND recorded_at < '{end:%Y-%m-%d}'"
+    )
+
+    stranded = db.execute(text(
+        f"SELECT EXISTS (SELECT 1 FROM {PARTITION_PREFIX}default WHERE {in_range})"
+    )).scalar()
+
+    if not stranded:
+        db.execute(text(
+            f"CREATE TABLE {name} PARTITION OF telemetry_history "
+            f"FOR VALUES {bounds}"
+        ))
+        return
+
+    db.execute(text(
+        f"CREATE TABLE {name} (LIKE telemetry_history "
+        f"INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING INDEXES)"
+    ))
+    db.execute(text(
+        f"WITH moved AS (DELETE FROM {PARTITION_PREFIX}default "
+        f"WHERE {in_range} RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    ))
+    db.execute(text(
+        f"ALTER TABLE telemetry_history ATTACH PARTITION {name} FOR VALUES {bounds}"
+    ))
+    logger.info("Moved telemetry readings from the default partition to %s", name)
+
+
+def ensure_partitions(db: Session, now: datetime):
+    db.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {PARTITION_PREFIX}default "
+        f"PARTITION OF telemetry_history DEFAULT"
+    ))
+
+    today = datetime(now.year, now.month, now.day)
+    days = [today + timedelta(days=offset) for offset in range(PARTITIONS_AHEAD + 1)]
+
+    # дні, що потрапили в DEFAULT через простій обслуговування
+    stranded = db.execute(text(
+        f"SELECT DISTINCT date_trunc('day', recorded_at) "
+        f"FROM {PARTITION_PREFIX}default "
+        f"WHERE recorded_at >= :since AND recorded_at < :until"
+    ), {
+        "since": today - timedelta(days=TELEMETRY_RAW_RETENTION_DAYS),
+        "until": days[-1] + timedelta(days=1),
+    }).scalars().all()
+
+    for day in sorted(set(days) | set(stranded)):
+        if partition_exists(db, partition_name(day)):
+            continue
+
+        try:
+            with db.begin_nested():
+                create_partition(db, day)
+        except DBAPIError:
+            logger.warning(
+                "Could not create telemetry partition %s, readings stay "
+                "in the default partition",
+                partition_name(day),
+                exc_info=True
+            )
+
+
+# Секції потрібні до першого запису телеметрії, тому вони створюються
+# під час запуску, а не лише періодичним завданням (яке може бути вимкнене)
+def prepare_partitions(now: datetime | None = None):
+    db = SessionLocal()
+
+    try:
+        db.execute(select(func.pg_advisory_xact_lock(MAINTENANCE_LOCK_KEY)))
+        ensure_partitions(db, now or datetime.utcnow())
+        db.commit()
+    finally:
+        db.close()
+
+
+def drop_expired_partitions(db: Session, now: datetime) -> list[str]:
+    cutoff = now - timedelta(days=TELEMETRY_RAW_RETENTION_DAYS)
+
+    partitions = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = 'telemetry_history'"
+    )).scalars().all()
+
+    dropped = []
+
+    for name in partitions:
+        suffix = name[len(PARTITION_PREFIX):]
+        try:
+            day = datetime.strptime(suffix, "%Y%m%d")
+        except ValueError:
+            continue
+
+        # секція містить дані за день [day, day + 1)
+        if day + timedelta(days=1) <= cutoff:
+            db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+            dropped.append(name)
+
+    db.execute(
+        TelemetryHistory.__table__.delete()
+        .where(TelemetryHistory.recorded_at < cutoff)
+    )
+
+    db.execute(
+        TelemetryRollups.__table__.delete()
+        .where(
+            TelemetryRollups.bucket_seconds == BUCKET_5M,
+            TelemetryRollups.bucket_start <
+            now - timedelta(days=TELEMETRY_5M_RETENTION_DAYS)
+        )
+    )
+
+    return dropped
+
+
+def bucket_floor(moment: datetime, seconds: int) -> datetime:
+    offset = int((moment - BUCKET_ORIGIN).total_seconds()) // seconds
+    return BUCKET_ORIGIN + timedelta(seconds=offset * seconds)
+
+
+def upsert_rollups(db: Session, source):
+    stmt = insert(TelemetryRollups).from_select(
+        [
+            "container_id",
+            "bucket_seconds",
+            "bucket_start",
+            "samples",
+            "min_fill",
+            "max_fill",
+            "avg_fill",
+            "max_temperature",
+            "tilt_count",
+        ],
+        source
+    )
+
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["container_id", "bucket_seconds", "bucket_start"],
+        set_={
+            "samples": stmt.excluded.samples,
+            "min_fill": stmt.excluded.min_fill,
+            "max_fill": stmt.excluded.max_fill,
+            "avg_fill": stmt.excluded.avg_fill,
+            "max_temperature": stmt.excluded.max_temperature,
+            "tilt_count": stmt.excluded.tilt_count,
+        }
+    )
+
+    db.execute(stmt)
+
+
+def rollup_5m(db: Session, since: datetime, until: datetime):
+    bucket = date_bin(BUCKET_5M, TelemetryHistory.recorded_at)
+
+    source = (
+        select(
+            TelemetryHistory.container_id,
+            BUCKET_5M,
+            bucket,
+            func.count(),
+            func.min(TelemetryHistory.fill_level),
+            func.max(TelemetryHistory.fill_level),
+            func.avg(TelemetryHistory.fill_level),
+            func.max(TelemetryHistory.temperature),
+            func.count(case((TelemetryHistory.tilted.is_(True), 1))),
+        )
+        .where(
+            TelemetryHistory.recorded_at >= since,
+            TelemetryHistory.recorded_at < until
+        )
+        .group_by(TelemetryHistory.container_id, bucket)
+    )
+
+    upsert_rollups(db, source)
+
+
+def rollup_1h(db: Session, since: datetime, until: datetime):
+    bucket = date_bin(BUCKET_1H, TelemetryRollups.bucket_start)
+
+    # годинні агрегати будуються з 5-хвилинних, а не з сирих показань
+    source = (
+        select(
+            TelemetryRollups.container_id,
+            BUCKET_1H,
+            bucket,
+            func.sum(TelemetryRollups.samples),
+            func.min(TelemetryRollups.min_fill),
+            func.max(TelemetryRollups.max_fill),
+            func.sum(TelemetryRollups.avg_fill * TelemetryRollups.samples) /
+            func.sum(TelemetryRollups.samples),
+            func.max(TelemetryRollups.max_temperature),
+            func.sum(TelemetryRollups.tilt_count),
+        )
+        .where(
+            TelemetryRollups.bucket_seconds == BUCKET_5M,
+            TelemetryRollups.bucket_start >= since,
+            TelemetryRollups.bucket_start < until
+        )
+        .group_by(TelemetryRollups.container_id, bucket)
+    )
+
+    upsert_rollups(db, source)
+
+
+# Початок останнього записаного агрегату; звідти продовжується згортання,
+# тож пропущені запуски (перезапуск, збій) наздоганяються
+def rollup_watermark(db: Session, seconds: int) -> datetime | None:
+    return db.execute(
+        select(func.max(TelemetryRollups.bucket_start))
+        .where(TelemetryRollups.bucket_seconds == seconds)
+    ).scalar()
+
+
+def rollup_since(
+    db: Session,
+    seconds: int,
+    late: datetime,
+    oldest: datetime
+) -> datetime:
+    watermark = rollup_watermark(db, seconds)
+
+    # старіші дані вже видалені за терміном зберігання
+    if watermark is None:
+        return oldest
+
+    return max(min(watermark, late), oldest)
+
+
+def run_telemetry_maintenance(now: datetime | None = None):
+    now = now or datetime.utcnow()
+    db = SessionLocal()
+
+    try:
+        locked = db.execute(
+            select(func.pg_try_advisory_xact_lock(MAINTENANCE_LOCK_KEY))
+        ).scalar()
+
+        if not locked:
+            return
+
+        ensure_partitions(db, now)
+
+        # перераховуємо також попередній інтервал, щоб врахувати запізнілі показання
+        since_5m = rollup_since(
+            db,
+            BUCKET_5M,
+            bucket_floor(now, BUCKET_5M) - timedelta(seconds=2 * BUCKET_5M),
+            bucket_floor(
+                now - timedelta(days=TELEMETRY_RAW_RETENTION_DAYS), BUCKET_5M
+            )
+        )
+        rollup_5m(db, since_5m, now)
+
+        since_1h = rollup_since(
+            db,
+            BUCKET_1H,
+            bucket_floor(now, BUCKET_1H) - timedelta(seconds=BUCKET_1H),
+            bucket_floor(
+                now - timedelta(days=TELEMETRY_5M_RETENTION_DAYS), BUCKET_1H
+            )
+        )
+        rollup_1h(db, since_1h, now)
+
+        dropped = drop_expired_partitions(db, now)
+
+        db.commit()
+
+        if dropped:
+            logger.info("Dropped telemetry partitions: %s", ", ".join(dropped))
+    finally:
+        db.close()
+
+
+telemetry_maintenance_job = register_periodic_job(
+    "telemetry-maintenance",
+    TELEMETRY_ROLLUP_INTERVAL,
+    run_telemetry_maintenance
+)